@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from django.core.signals import request_started
+
+        from api_yamdb.pool import check_persistent_connections
+
+        from .v1 import signals  # noqa: F401
+
+        request_started.connect(check_persistent_connections)
@@ -0,0 +1,206 @@
+"""Генератор HTTP-нагрузки на asyncio для замеров производительности.
+
+Каждый виртуальный клиент держит одно keep-alive соединение и шлёт
+запросы по очереди, поэтому число клиентов равно числу одновременных
+запросов к серверу. Зависимостей, кроме стандартной библиотеки, нет.
+"""
+import asyncio
+import math
+import socket
+import time
+from collections import Counter, defaultdict
+from itertools import cycle
+from urllib.parse import urlsplit
+
+
+def percentile(values, share):
+    """Перцентиль отсортированного списка методом ближайшего ранга."""
+    if not values:
+        return None
+    return values[max(math.ceil(share * len(values)) - 1, 0)]
+
+
+class LoadResult:
+    """Задержки и коды ответов одного прогона."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.elapsed = 0
+
+    @classmethod
+    def merge(cls, results):
+        merged = cls()
+        for result in results:
+            merged.latencies += result.latencies
+            merged.statuses.update(result.statuses)
+            merged.errors += result.errors
+            merged.elapsed = max(merged.elapsed, result.elapsed)
+        return merged
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.elapsed if self.elapsed else 0
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        return {
+            'requests': len(latencies),
+            'errors': self.errors,
+            'statuses': dict(self.statuses),
+            'rps': round(self.throughput, 1),
+            **{
+                f'p{share}': round(percentile(latencies, share / 100) * 1000,
+                                   2) if latencies else None
+                for share in (50, 95, 99)
+            },
+        }
+
+
+async def read_headers(reader):
+    """Читает заголовки ответа в словарь с именами в нижнем регистре."""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+
+async def read_response(reader):
+    """Читает ответ HTTP/1.1, возвращает код и признак keep-alive."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Сервер закрыл соединение')
+    status = int(status_line.split()[1])
+    headers = await read_headers(reader)
+    keep_alive = headers.get('connection') != 'close'
+    if 'chunked' in headers.get('transfer-encoding', ''):
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    else:
+        await reader.read()
+        keep_alive = False
+    return status, keep_alive
+
+
+class Client:
+    """Виртуальный клиент с одним keep-alive соединением."""
+
+    def __init__(self, host, port, headers):
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b''):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}']
+        head += [f'{name}: {value}' for name, value in self.headers.items()]
+        if body:
+            head.append(f'Content-Length: {len(body)}')
+        self.writer.write(
+            ('\r\n'.join(head) + '\r\n\r\n').encode('latin1') + body
+        )
+        try:
+            status, keep_alive = await read_response(self.reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+        if not keep_alive:
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_mix(base_url, next_request, concurrency, duration,
+                  headers=None):
+    """Нагружает сервер ``concurrency`` клиентами ``duration`` секунд.
+
+    ``next_request()`` возвращает четвёрку (имя, метод, путь, тело) для
+    очередного запроса. Результат — словарь {имя: LoadResult}.
+    """
+    url = urlsplit(base_url)
+    results = defaultdict(LoadResult)
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        client = Client(url.hostname, url.port or 80, headers or {})
+        try:
+            while time.perf_counter() < deadline:
+                name, method, path, body = next_request()
+                result = results[name]
+                started = time.perf_counter()
+                try:
+                    status = await client.request(
+                        method, url.path.rstrip('/') + path, body
+                    )
+                except (OSError, asyncio.IncompleteReadError):
+                    result.errors += 1
+                    continue
+                result.latencies.append(time.perf_counter() - started)
+                result.statuses[status] += 1
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for result in results.values():
+        result.elapsed = elapsed
+    return dict(results)
+
+
+async def run_load(base_url, requests, concurrency, duration, headers=None):
+    """Как run_mix, но по кругу из списка и с общим результатом.
+
+    ``requests`` — непустой список пар (метод, путь) или троек (метод,
+    путь, тело).
+    """
+    requests = cycle(requests)
+
+    def next_request():
+        method, path, *body = next(requests)
+        return '', method, path, body[0] if body else b''
+
+    results = await run_mix(
+        base_url, next_request, concurrency, duration, headers
+    )
+    return LoadResult.merge(results.values())
+
+
+def free_port():
+    """Свободный TCP-порт на локальном интерфейсе."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url, path, timeout, interval=0.2):
+    """Ждёт первого ответа сервера на ``path`` и возвращает его код."""
+    url = urlsplit(base_url)
+    deadline = time.perf_counter() + timeout
+    while True:
+        client = Client(url.hostname, url.port or 80, {})
+        try:
+            return await client.request('GET', url.path.rstrip('/') + path)
+        except (OSError, asyncio.IncompleteReadError):
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(interval)
+        finally:
+            client.close()
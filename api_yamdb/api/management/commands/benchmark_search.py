@@ -0,0 +1,72 @@
+import random
+import string
+import time
+
+from api.v1.search import rank_by_similarity
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер поиска произведений по подстроке на большом каталоге. '
+        'Каталог создаётся во временной транзакции и откатывается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=200000)
+        parser.add_argument('--query', default='кольц')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Замер имеет смысл только на PostgreSQL')
+        with transaction.atomic():
+            self.fill(options['titles'], options['query'], options['seed'])
+            self.measure(options['query'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def fill(self, count, query, seed):
+        rnd = random.Random(seed)
+        letters = string.ascii_lowercase + 'абвгдеёжзийклмнопрстуфхцчшщыэюя'
+
+        def word():
+            return ''.join(rnd.choices(letters, k=rnd.randint(3, 9)))
+
+        titles = (
+            Title(
+                name=' '.join(word() for _ in range(rnd.randint(1, 4)))
+                if index % 1000 else f'Властелин {query}а {index}',
+                year=rnd.randint(1900, 2020),
+            )
+            for index in range(count)
+        )
+        started = time.perf_counter()
+        Title.objects.bulk_create(titles, batch_size=10000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE reviews_title')
+        self.stdout.write(
+            f'Создано произведений: {count} '
+            f'за {time.perf_counter() - started:.1f} с'
+        )
+
+    def measure(self, query, repeat):
+        queryset = Title.objects.filter(name__icontains=query)
+        plan = queryset.explain(analyze=True)
+        self.stdout.write(plan)
+        if 'title_name_trgm_idx' in plan:
+            self.stdout.write(self.style.SUCCESS('Индекс pg_trgm в плане'))
+        else:
+            self.stdout.write(self.style.WARNING('Индекс pg_trgm не найден'))
+        for label, qs in (
+            ('icontains', queryset.order_by('name')[:10]),
+            ('icontains + similarity', rank_by_similarity(
+                queryset, 'name', query)[:10]),
+        ):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(qs)
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f'{label}: {elapsed:.2f} мс на запрос')
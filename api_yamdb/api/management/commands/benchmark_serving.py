@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from api.loadtest import free_port, run_load, wait_ready
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from reviews.models import Review, Title
+
+SERVERS = {
+    'wsgi': ['api_yamdb.wsgi:application'],
+    'asgi': [
+        'api_yamdb.asgi:application',
+        '--worker-class', 'uvicorn.workers.UvicornH11Worker',
+    ],
+}
+
+
+async def hold_slow_clients(port, count, duration):
+    """Клиенты, которые передают заголовки запроса по байту в секунду."""
+    async def slow_client():
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            return
+        writer.write(b'GET /api/v1/titles/ HTTP/1.1\r\nHost: localhost\r\n')
+        deadline = time.perf_counter() + duration
+        try:
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(1)
+                writer.write(b'X')
+                await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(slow_client() for _ in range(count)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение пропускной способности и задержек gunicorn с '
+        'синхронными воркерами (WSGI) и с воркерами uvicorn (ASGI) на '
+        'горячих GET-эндпоинтах. Серверы запускаются на текущей БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=sorted(SERVERS), action='append',
+            help='Какие режимы замерять; по умолчанию оба.',
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument('--duration', type=float, default=20)
+        parser.add_argument(
+            '--slow-clients', type=int, default=0,
+            help='Сколько медленных клиентов держат соединения во время '
+                 'замера.',
+        )
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        paths = self.hot_paths()
+        results = {}
+        for mode in options['mode'] or sorted(SERVERS):
+            port = free_port()
+            server = self.start_server(mode, port, options['workers'])
+            try:
+                results[mode] = asyncio.get_event_loop().run_until_complete(
+                    self.measure(port, paths, options)
+                )
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+        if options['json']:
+            self.stdout.write(json.dumps(results, ensure_ascii=False))
+            return
+        for mode, summary in results.items():
+            self.stdout.write(
+                f'{mode}: {summary["rps"]} запр/с, '
+                f'p50 {summary["p50"]} мс, p99 {summary["p99"]} мс, '
+                f'ошибок {summary["errors"]}, коды {summary["statuses"]}'
+            )
+
+    def hot_paths(self):
+        title_ids = list(Title.objects.order_by('-review_count').values_list(
+            'pk', flat=True
+        )[:20])
+        if not title_ids:
+            raise CommandError('В каталоге нет произведений для замера')
+        paths = [('GET', '/api/v1/titles/')]
+        paths += [('GET', f'/api/v1/titles/{pk}/') for pk in title_ids]
+        paths += [
+            ('GET', f'/api/v1/titles/{pk}/reviews/')
+            for pk in Review.objects.filter(
+                title_id__in=title_ids
+            ).values_list('title_id', flat=True).distinct()
+        ]
+        return paths
+
+    def start_server(self, mode, port, workers):
+        command = [
+            sys.executable, '-m', 'gunicorn.app.wsgiapp', *SERVERS[mode],
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers),
+            '--log-level', 'warning',
+        ]
+        server = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=os.environ.copy()
+        )
+        try:
+            asyncio.get_event_loop().run_until_complete(
+                wait_ready(f'http://127.0.0.1:{port}', '/api/v1/', 30)
+            )
+        except OSError:
+            server.kill()
+            raise CommandError(f'Сервер {mode} не запустился')
+        return server
+
+    async def measure(self, port, paths, options):
+        base_url = f'http://127.0.0.1:{port}'
+        # Прогрев: импорт модулей, соединения с БД и кэш в каждом воркере.
+        await run_load(base_url, paths, options['workers'] * 4, 2)
+        load = run_load(
+            base_url, paths, options['concurrency'], options['duration']
+        )
+        if not options['slow_clients']:
+            return (await load).summary()
+        result, _ = await asyncio.gather(load, hold_slow_clients(
+            port, options['slow_clients'], options['duration']
+        ))
+        return result.summary()
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+from api.loadtest import free_port, wait_ready
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = ('api_yamdb.settings', 'api_yamdb.settings_api')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер времени от запуска gunicorn до первого ответа API для '
+        'полного и API-профиля настроек, с preload_app и без него.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-profile', choices=PROFILES, action='append',
+            help='Какие профили замерять; по умолчанию оба.',
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--path', default='/api/v1/titles/')
+
+    def handle(self, *args, **options):
+        for profile in options['settings_profile'] or PROFILES:
+            for preload in (False, True):
+                timings = [
+                    self.time_to_first_response(profile, preload, options)
+                    for _ in range(options['repeat'])
+                ]
+                self.stdout.write(
+                    f'{profile}, preload={preload}: медиана '
+                    f'{statistics.median(timings) * 1000:.0f} мс, '
+                    f'мин. {min(timings) * 1000:.0f} мс, '
+                    f'макс. {max(timings) * 1000:.0f} мс'
+                )
+
+    def time_to_first_response(self, profile, preload, options):
+        """Время от запуска процесса до первого ответа на ``--path``.
+
+        Сокет слушает мастер-процесс, поэтому запрос, отправленный до
+        готовности воркеров, ждёт в очереди: замер включает импорт
+        приложения, fork воркеров и обработку первого запроса.
+        """
+        port = free_port()
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': profile,
+            'GUNICORN_BIND': f'127.0.0.1:{port}',
+            'GUNICORN_WORKERS': str(options['workers']),
+            'GUNICORN_PRELOAD': str(preload),
+        }
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn.app.wsgiapp',
+             'api_yamdb.wsgi:application', '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+        try:
+            status = asyncio.get_event_loop().run_until_complete(wait_ready(
+                f'http://127.0.0.1:{port}', options['path'], 60, 0.005
+            ))
+            elapsed = time.perf_counter() - started
+        except OSError:
+            raise CommandError(f'Сервер с настройками {profile} не запустился')
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+        if status != 200:
+            raise CommandError(f'{options["path"]} ответил кодом {status}')
+        return elapsed
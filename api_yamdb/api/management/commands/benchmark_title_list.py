@@ -0,0 +1,104 @@
+import random
+import time
+
+from api.v1.serializers import (TitleGetSerializer, TitleListSerializer,
+                                TitleRowsListSerializer)
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер сериализации страницы списка произведений: '
+        'TitleGetSerializer по объектам моделей против '
+        'TitleRowsListSerializer по строкам .values(). Каталог создаётся '
+        'во временной транзакции и откатывается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--min-speedup', type=float, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.fill(options['titles'], options['seed'])
+            self.measure(options)
+            transaction.set_rollback(True)
+
+    def fill(self, count, seed):
+        rnd = random.Random(seed)
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'bench-category-{i}')
+            for i in range(10)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {i}', slug=f'bench-genre-{i}')
+            for i in range(20)
+        )
+        # bulk_create возвращает ключи не на всех СУБД.
+        categories = list(
+            Category.objects.filter(slug__startswith='bench-category-')
+        )
+        genres = list(Genre.objects.filter(slug__startswith='bench-genre-'))
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {index}',
+                year=rnd.randint(1900, 2020),
+                description='Описание ' * rnd.randint(0, 20) or None,
+                category=rnd.choice(categories),
+                score_sum=rnd.randint(0, 500),
+                review_count=rnd.randint(0, 50),
+            )
+            for index in range(count)
+        )
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title_id, genre=genre)
+            for title_id in Title.objects.filter(
+                name__startswith='Произведение '
+            ).values_list('pk', flat=True)
+            for genre in rnd.sample(genres, rnd.randint(1, 3))
+        )
+
+    def measure(self, options):
+        page = options['page_size']
+        titles = Title.objects.order_by('name')
+
+        def models():
+            return TitleGetSerializer(
+                titles.select_related('category').prefetch_related('genre')[
+                    :page
+                ],
+                many=True,
+            ).data
+
+        def rows():
+            return TitleListSerializer(
+                titles.values(*TitleRowsListSerializer.values)[:page],
+                many=True,
+            ).data
+
+        results = {}
+        for label, build in (('TitleGetSerializer', models),
+                             ('TitleRowsListSerializer', rows)):
+            build()
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                build()
+            results[label] = (
+                (time.perf_counter() - started) / options['repeat'] * 1000
+            )
+            self.stdout.write(
+                f'{label}: {results[label]:.2f} мс на страницу из {page}'
+            )
+        speedup = (
+            results['TitleGetSerializer'] / results['TitleRowsListSerializer']
+        )
+        message = f'Ускорение: {speedup:.1f}x'
+        if speedup >= options['min_speedup']:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import random
+
+from api.loadtest import LoadResult, run_mix, wait_ready
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+# Имя, вес, метод и шаблон пути запроса. Подстановки: {title}, {review}
+# (вместе с {title} своего произведения), {genre}, {category}, {page} и
+# {titles} — несколько id популярных произведений через запятую.
+DEFAULT_MIX = (
+    ('titles-list', 25, 'GET', '/api/v1/titles/?page={page}'),
+    ('titles-by-genre', 8, 'GET', '/api/v1/titles/?genre={genre}'),
+    ('titles-detail', 25, 'GET', '/api/v1/titles/{title}/'),
+    ('reviews-list', 20, 'GET', '/api/v1/titles/{title}/reviews/'),
+    ('reviews-detail', 5, 'GET', '/api/v1/titles/{title}/reviews/{review}/'),
+    ('comments-list', 7, 'GET',
+     '/api/v1/titles/{title}/reviews/{review}/comments/'),
+    ('categories-list', 3, 'GET', '/api/v1/categories/'),
+    ('genres-list', 2, 'GET', '/api/v1/genres/'),
+    ('reviews-latest', 5, 'GET', '/api/v1/reviews/latest/?titles={titles}'),
+)
+REVIEW_SAMPLE = 10000
+COMPARED = ('rps', 'p50', 'p95', 'p99')
+
+
+class RequestMix:
+    """Случайные запросы по весам с id из текущей базы.
+
+    Произведения выбираются с весом по числу обзоров, обзоры — случайной
+    выборкой из таблицы, поэтому популярные произведения получают и
+    больше запросов.
+    """
+
+    def __init__(self, mix, seed):
+        self.rnd = random.Random(seed)
+        self.mix = mix
+        self.cum_weights = []
+        total = 0
+        for _, weight, _, _ in mix:
+            total += weight
+            self.cum_weights.append(total)
+        titles = list(Title.objects.values_list('pk', 'review_count'))
+        if not titles:
+            raise CommandError('В базе нет произведений')
+        self.title_ids = [pk for pk, _ in titles]
+        self.title_weights = []
+        total = 0
+        for _, count in titles:
+            total += count + 1
+            self.title_weights.append(total)
+        self.popular = [
+            pk for pk, _ in sorted(titles, key=lambda row: -row[1])[:20]
+        ]
+        self.reviews = self.sample_reviews()
+        if not self.reviews and any('{review}' in item[3] for item in mix):
+            raise CommandError('В смеси есть запросы обзоров, а в базе их нет')
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.pages = max(min(len(titles) // settings.REST_FRAMEWORK[
+            'PAGE_SIZE'
+        ], 100), 1)
+
+    def sample_reviews(self):
+        """Пары (произведение, обзор) для случайных id из диапазона ключей."""
+        bounds = Review.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            return []
+        wanted = {
+            self.rnd.randint(bounds['first'], bounds['last'])
+            for _ in range(REVIEW_SAMPLE)
+        }
+        return list(Review.objects.filter(pk__in=wanted).values_list(
+            'title_id', 'pk'
+        ))
+
+    def values(self, path):
+        if '{review}' in path:
+            title, review = self.rnd.choice(self.reviews)
+        else:
+            review = None
+            title = self.rnd.choices(
+                self.title_ids, cum_weights=self.title_weights
+            )[0]
+        return {
+            'title': title,
+            'review': review,
+            'genre': self.rnd.choice(self.genres) if self.genres else '',
+            'category': (
+                self.rnd.choice(self.categories) if self.categories else ''
+            ),
+            'page': 1 + int(self.pages * self.rnd.random() ** 2),
+            'titles': ','.join(map(str, self.rnd.sample(
+                self.popular, min(5, len(self.popular))
+            ))),
+        }
+
+    def __call__(self):
+        name, _, method, path = self.rnd.choices(
+            self.mix, cum_weights=self.cum_weights
+        )[0]
+        return name, method, path.format(**self.values(path)), b''
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон по взвешенной смеси запросов к API с отчётом '
+        'p50/p95/p99 и запр/с по каждому эндпоинту. Результаты можно '
+        'сохранить как базовую линию и сравнивать с ней следующие прогоны.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--duration', type=float, default=60)
+        parser.add_argument('--warmup', type=float, default=5)
+        parser.add_argument(
+            '--mix',
+            help='JSON-файл со списком [имя, вес, метод, шаблон пути]',
+        )
+        parser.add_argument('--token', help='JWT для заголовка Authorization')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--baseline-dir',
+            default=os.path.join(settings.BASE_DIR, 'loadtest_baselines'),
+        )
+        parser.add_argument('--save', help='Сохранить прогон под этим именем')
+        parser.add_argument(
+            '--compare', help='Сравнить с сохранённым прогоном'
+        )
+
+    def handle(self, *args, **options):
+        mix = DEFAULT_MIX
+        if options['mix']:
+            with open(options['mix'], encoding='utf-8') as mix_file:
+                mix = [tuple(item) for item in json.load(mix_file)]
+        baseline = self.load(options) if options['compare'] else None
+        next_request = RequestMix(mix, options['seed'])
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Bearer {options["token"]}'
+        loop = asyncio.get_event_loop()
+        try:
+            loop.run_until_complete(
+                wait_ready(options['base_url'], '/api/v1/', 10)
+            )
+        except OSError:
+            raise CommandError(f'Сервер {options["base_url"]} недоступен')
+        if options['warmup']:
+            loop.run_until_complete(run_mix(
+                options['base_url'], next_request, options['concurrency'],
+                options['warmup'], headers,
+            ))
+        results = loop.run_until_complete(run_mix(
+            options['base_url'], next_request, options['concurrency'],
+            options['duration'], headers,
+        ))
+        report = {
+            'created': timezone.now().isoformat(),
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'duration': options['duration'],
+            'mix': [list(item) for item in mix],
+            'dataset': {
+                model._meta.model_name: model.objects.count()
+                for model in (User, Title, Review, Comment)
+            },
+            'endpoints': {
+                name: results[name].summary()
+                for name, *_ in mix if name in results
+            },
+            'total': LoadResult.merge(results.values()).summary(),
+        }
+        self.print_report(report, baseline)
+        if options['save']:
+            self.save(options, report)
+
+    def baseline_path(self, options, name):
+        return os.path.join(options['baseline_dir'], f'{name}.json')
+
+    def load(self, options):
+        path = self.baseline_path(options, options['compare'])
+        if not os.path.exists(path):
+            raise CommandError(f'Базовая линия {path} не найдена')
+        with open(path, encoding='utf-8') as baseline_file:
+            return json.load(baseline_file)
+
+    def save(self, options, report):
+        os.makedirs(options['baseline_dir'], exist_ok=True)
+        path = self.baseline_path(options, options['save'])
+        with open(path, 'w', encoding='utf-8') as baseline_file:
+            json.dump(report, baseline_file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Сохранено: {path}'))
+
+    def print_report(self, report, baseline):
+        self.stdout.write(
+            f'{"эндпоинт":<18}{"запросов":>9}{"запр/с":>9}{"p50":>9}'
+            f'{"p95":>9}{"p99":>9}{"ошибок":>8}  коды'
+        )
+        rows = [*report['endpoints'].items(), ('итого', report['total'])]
+        for name, summary in rows:
+            # Без успешных ответов перцентили равны None.
+            self.stdout.write(f'{name:<18}{summary["requests"]:>9}' + ''.join(
+                f'{str(summary[key]):>9}' for key in COMPARED
+            ) + f'{summary["errors"]:>8}  {summary["statuses"]}')
+            if baseline is not None:
+                self.print_change(name, summary, baseline)
+
+    def print_change(self, name, summary, baseline):
+        if name == 'итого':
+            before = baseline['total']
+        else:
+            before = baseline['endpoints'].get(name)
+        if not before:
+            return
+        changes = []
+        for key in COMPARED:
+            if before[key] and summary[key] is not None:
+                change = (summary[key] - before[key]) / before[key] * 100
+                changes.append(f'{key} {change:+.1f}%')
+        self.stdout.write(f'{"":<18}к базовой линии: {", ".join(changes)}')
@@ -0,0 +1,216 @@
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.profiling')
+
+# Профиль текущего запроса для замеров вне middleware (сериализаторы).
+current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """Замеры одного запроса: SQL, код представления, сериализация,
+    рендеринг."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.render_started = None
+        self.finished = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.streaming = False
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    @contextmanager
+    def serialization(self):
+        """Замер сериализации без SQL, выполненного внутри неё."""
+        self.serializing = True
+        started = time.perf_counter()
+        db_time = self.db_time
+        try:
+            yield
+        finally:
+            self.serializing = False
+            self.serialize_time += (
+                time.perf_counter() - started - (self.db_time - db_time)
+            )
+
+    def timings(self):
+        """Длительности этапов в миллисекундах."""
+        finished = self.finished or time.perf_counter()
+        view_started = self.view_started or self.started
+        view_finished = self.render_started or finished
+        return {
+            'db': self.db_time * 1000,
+            'view': (
+                view_finished - view_started - self.db_time
+                - self.serialize_time
+            ) * 1000,
+            'serialize': self.serialize_time * 1000,
+            'render': (finished - view_finished) * 1000,
+            'total': (finished - self.started) * 1000,
+        }
+
+    def server_timing(self):
+        timings = self.timings()
+        # Заголовок потокового ответа уходит до чтения его тела.
+        queries = (
+            f'{self.queries} queries before streaming' if self.streaming
+            else f'{self.queries} queries'
+        )
+        parts = [f'db;dur={timings["db"]:.2f};desc="{queries}"']
+        parts.extend(
+            f'{name};dur={timings[name]:.2f}'
+            for name in ('view', 'serialize', 'render', 'total')
+        )
+        return ', '.join(parts)
+
+
+def profiled_serialization(to_representation):
+    """Относит время ``to_representation`` к сериализации в профиле.
+
+    Замеряется только внешний вызов: вложенные сериализаторы и элементы
+    списка внутри него в сумму второй раз не попадают.
+    """
+
+    @wraps(to_representation)
+    def wrapper(serializer, instance):
+        profile = current_profile.get()
+        if profile is None or profile.serializing:
+            return to_representation(serializer, instance)
+        with profile.serialization():
+            return to_representation(serializer, instance)
+
+    return wrapper
+
+
+class ProfiledSerializerMixin:
+    """Сериализатор, время которого попадает в профиль запроса."""
+
+    @profiled_serialization
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+class ProfiledStream:
+    """Тело потокового ответа, закрытие которого завершает профиль.
+
+    Django закрывает его вместе с ответом, даже если тело не читали,
+    поэтому обёртки SQL не остаются на соединении после запроса.
+    """
+
+    def __init__(self, content, on_close):
+        self.content = content
+        self.on_close = on_close
+
+    def __iter__(self):
+        return iter(self.content)
+
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class ProfilingMiddleware:
+    """Добавляет к ответу заголовок Server-Timing с профилем запроса.
+
+    Профилируется доля запросов ``PROFILING_SAMPLE_RATE`` и, если
+    разрешено ``PROFILING_ALLOW_HEADER``, запросы с заголовком
+    ``X-Profile``. Запросы дольше ``PROFILING_SLOW_REQUEST_MS``
+    записываются в лог ``api.profiling``. Сериализация замеряется
+    через ``profiled_serialization``. SQL потокового ответа
+    выполняется при чтении тела, уже после заголовков: он учитывается
+    в логе медленных запросов, который пишется при закрытии ответа.
+    """
+
+    header = 'HTTP_X_PROFILE'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def should_profile(self, request):
+        if settings.PROFILING_ALLOW_HEADER and request.META.get(self.header):
+            return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+        profile = request.profile = RequestProfile()
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(
+                connection.execute_wrapper(profile.record_query)
+            )
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+        finally:
+            current_profile.reset(token)
+        if response.streaming:
+            profile.streaming = True
+            response['Server-Timing'] = profile.server_timing()
+            response.streaming_content = self.profile_stream(
+                response.streaming_content, stack, request, response, profile
+            )
+            return response
+        stack.close()
+        profile.finished = time.perf_counter()
+        response['Server-Timing'] = profile.server_timing()
+        self.log_slow_request(request, response, profile)
+        return response
+
+    def profile_stream(self, content, stack, request, response, profile):
+        """Тело потокового ответа; замеры SQL идут до его закрытия."""
+
+        def finish():
+            stack.close()
+            profile.finished = time.perf_counter()
+            self.log_slow_request(request, response, profile)
+
+        return ProfiledStream(content, finish)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.render_started = time.perf_counter()
+        return response
+
+    def log_slow_request(self, request, response, profile):
+        threshold = settings.PROFILING_SLOW_REQUEST_MS
+        timings = profile.timings()
+        if threshold is None or timings['total'] < threshold:
+            return
+        logger.warning(
+            'Медленный запрос %s %s (%s): %.0f мс, SQL: %d за %.0f мс, '
+            'сериализация %.0f мс, рендеринг %.0f мс',
+            request.method, request.get_full_path(), response.status_code,
+            timings['total'], profile.queries, timings['db'],
+            timings['serialize'], timings['render'],
+        )
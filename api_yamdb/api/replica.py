@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_KEY = 'db:primary-pin:{user_id}'
+PIN_COOKIE = 'primary_pin'
+PIN_SALT = 'api.replica.pin'
+
+current_request = ContextVar('current_request', default=None)
+
+
+def pin_to_primary(user, response):
+    """Читает данные пользователя с основной БД ``REPLICA_PIN_SECONDS``.
+
+    Отметка уходит клиенту подписанной cookie: следующий запрос может
+    попасть в другой воркер, а кэш по умолчанию у каждого процесса свой.
+    Запись в кэше нужна клиентам без cookie и работает с общим
+    CACHE_BACKEND.
+    """
+    if settings.REPLICA_PIN_SECONDS <= 0:
+        return
+    cache.set(
+        PIN_KEY.format(user_id=user.pk), True, settings.REPLICA_PIN_SECONDS
+    )
+    response.set_cookie(
+        PIN_COOKIE, signing.dumps(user.pk, salt=PIN_SALT),
+        max_age=settings.REPLICA_PIN_SECONDS, httponly=True,
+    )
+
+
+def pinned_by_cookie(request, user):
+    value = request.COOKIES.get(PIN_COOKIE)
+    if value is None:
+        return False
+    try:
+        return signing.loads(
+            value, salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS
+        ) == user.pk
+    except signing.BadSignature:
+        return False
+
+
+@contextmanager
+def primary_reads():
+    """Временно направляет чтения текущего запроса на основную БД."""
+    token = current_request.set(None)
+    try:
+        yield
+    finally:
+        current_request.reset(token)
+
+
+def known_user(request):
+    """Пользователь запроса, если он уже известен, без обращения к БД.
+
+    До аутентификации в DRF ``request.user`` — ленивый объект сессионной
+    аутентификации; его вычисление само читает из БД, поэтому здесь оно
+    не запускается.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+class ReadRouting:
+    """Решение о чтении с реплики для одного запроса."""
+
+    def __init__(self, request):
+        self.request = request
+        self.safe = request.method in SAFE_METHODS
+        self.pinned = None
+
+    def use_replica(self):
+        if not self.safe:
+            return False
+        if self.pinned is None:
+            user = known_user(self.request)
+            if user is None:
+                # Пользователь ещё не известен: закреплять нечего.
+                return True
+            self.pinned = pinned_by_cookie(self.request, user) or bool(
+                cache.get(PIN_KEY.format(user_id=user.pk))
+            )
+        return not self.pinned
+
+
+class ReplicaRoutingMiddleware:
+    """Передаёт маршрутизатору БД метод запроса и пользователя.
+
+    После успешного небезопасного запроса аутентифицированный
+    пользователь закрепляется за основной БД, чтобы его запись не
+    «пропала» из-за задержки репликации.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(ReadRouting(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = known_user(request)
+            if user is not None:
+                pin_to_primary(user, response)
+        return response
+
+
+class PrimaryReplicaRouter:
+    """Чтения безопасных HTTP-запросов идут на реплику, остальное — на
+    основную БД.
+
+    Без алиаса ``replica`` в DATABASES и вне HTTP-запросов (команды
+    manage.py, воркеры) маршрутизатор ничего не меняет.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = current_request.get()
+        if (
+            routing is None
+            or REPLICA_DB_ALIAS not in settings.DATABASES
+            or not routing.use_replica()
+        ):
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная БД.
+        return True
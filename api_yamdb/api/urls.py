@@ -1,8 +1,10 @@
-from api.v1.views import (CategoryViewSet, CommentViewSet,
-                          ConfirmationCodeTokenView, GenreViewSet,
-                          ReviewViewSet, SignUpView, TitleViewSet,
-                          UsersViewSet)
-from django.urls import include, path
+from api.v1.views import (CatalogCacheStatsView, CatalogExportView,
+                          CategoryViewSet, CommentViewSet,
+                          ConfirmationCodeTokenView, DatabaseStatsView,
+                          GenreViewSet, LatestReviewsView, ReviewBulkView,
+                          ReviewViewSet, SignUpView, ThrottleStatsView,
+                          TitleViewSet, UsersViewSet)
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 app_name = 'api'
@@ -30,6 +32,21 @@ auth = [
 v1_urls = [
     path('', include(v1_router.urls)),
     path('auth/', include(auth)),
+    path(
+        'reviews/latest/', LatestReviewsView.as_view(), name='reviews-latest'
+    ),
+    path('reviews/bulk/', ReviewBulkView.as_view(), name='reviews-bulk'),
+    path('cache-stats/', CatalogCacheStatsView.as_view(), name='cache-stats'),
+    path('db-stats/', DatabaseStatsView.as_view(), name='db-stats'),
+    path(
+        'throttle-stats/', ThrottleStatsView.as_view(),
+        name='throttle-stats',
+    ),
+    re_path(
+        r'^export/(?P<dataset>titles|reviews)/$',
+        CatalogExportView.as_view(),
+        name='export',
+    ),
 ]
 
 
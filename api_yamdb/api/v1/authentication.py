@@ -0,0 +1,122 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from users.models import User
+
+# Поля пользователя, которые кладутся в токен и нужны для проверки прав.
+TOKEN_USER_CLAIMS = (
+    'username', 'role', 'is_superuser', 'is_staff', 'is_active'
+)
+
+
+class UserCache:
+    """Кэш пользователей в памяти процесса с ограниченным временем жизни.
+
+    Сигналы сохранения и удаления User сбрасывают записи только в текущем
+    процессе, в остальных воркерах запись живёт не дольше таймаута.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        with self.lock:
+            self.entries[user_id] = (
+                time.monotonic() + settings.AUTH_USER_CACHE_TIMEOUT, user
+            )
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > settings.AUTH_USER_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+def add_user_claims(token, user):
+    """Добавляет в токен поля, по которым проверяются права."""
+    for claim in TOKEN_USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def user_from_claims(validated_token):
+    """Пользователь, собранный из токена без обращения к БД.
+
+    Поля, которых нет в токене, отложены (deferred): при обращении к ним
+    Django загрузит их из базы.
+    """
+    claims = {
+        claim: validated_token[claim] for claim in TOKEN_USER_CLAIMS
+    }
+    claims[User._meta.pk.attname] = validated_token[
+        api_settings.USER_ID_CLAIM
+    ]
+    # from_db ждёт значения в порядке полей модели, а не в порядке имён.
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in claims
+    ]
+    return User.from_db(
+        DEFAULT_DB_ALIAS, field_names,
+        [claims[name] for name in field_names],
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя на каждый запрос.
+
+    По умолчанию пользователь берётся из короткоживущего кэша процесса.
+    При ``AUTH_STATELESS_TOKENS = True`` пользователь собирается из полей
+    токена, выданного ConfirmationCodeTokenView; смена роли и блокировка
+    пользователя в этом режиме вступают в силу только с новым токеном.
+    """
+
+    def get_user(self, validated_token):
+        if settings.AUTH_STATELESS_TOKENS and all(
+            claim in validated_token
+            for claim in (api_settings.USER_ID_CLAIM, *TOKEN_USER_CLAIMS)
+        ):
+            user = user_from_claims(validated_token)
+        else:
+            user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+            user = user_cache.get(user_id)
+            if user is None:
+                user = super().get_user(validated_token)
+                user_cache.set(user_id, user)
+            user = copy.deepcopy(user)
+        # Проверка JWTAuthentication при загрузке пользователя из БД
+        # не выполняется ни для токена, ни для записи из кэша.
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
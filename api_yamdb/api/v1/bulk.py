@@ -0,0 +1,215 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from reviews.signals import shift_title_ratings
+
+from .cache import bump_model_version
+from .serializers import (DUPLICATE_REVIEW_MESSAGE, ReviewBulkSerializer,
+                          TitleBulkSerializer)
+
+SLUG_NOT_FOUND = serializers.SlugRelatedField.default_error_messages[
+    'does_not_exist'
+]
+PK_NOT_FOUND = serializers.PrimaryKeyRelatedField.default_error_messages[
+    'does_not_exist'
+]
+
+
+def bulk_items(request):
+    """Список объектов из тела запроса пакетной записи."""
+    items = request.data
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError(
+            'Ожидается непустой список объектов.'
+        )
+    if len(items) > settings.BULK_WRITE_MAX_ITEMS:
+        raise serializers.ValidationError(
+            f'Не более {settings.BULK_WRITE_MAX_ITEMS} объектов за запрос.'
+        )
+    return items
+
+
+def bulk_response(results):
+    """201, если созданы все объекты, 400 — если ни один, иначе 207."""
+    created = sum(result['status'] == status.HTTP_201_CREATED
+                  for result in results)
+    if created == len(results):
+        code = status.HTTP_201_CREATED
+    elif not created:
+        code = status.HTTP_400_BAD_REQUEST
+    else:
+        code = status.HTTP_207_MULTI_STATUS
+    return Response(results, status=code)
+
+
+def validate_items(serializer_class, items, context):
+    """Проверяет элементы по отдельности, не обращаясь к БД."""
+    checked = [
+        serializer_class(data=item, context=context) for item in items
+    ]
+    errors = {
+        index: serializer.errors for index, serializer in enumerate(checked)
+        if not serializer.is_valid()
+    }
+    return checked, errors
+
+
+def collect_results(checked, errors, created):
+    results = []
+    for index, serializer in enumerate(checked):
+        if index in errors:
+            results.append({
+                'status': status.HTTP_400_BAD_REQUEST,
+                'errors': errors[index],
+            })
+        else:
+            results.append({
+                'status': status.HTTP_201_CREATED,
+                'data': created[index],
+            })
+    return results
+
+
+def create_titles(items, context):
+    """Создаёт произведения пакетом вместе со связями с жанрами.
+
+    Категории и жанры всего пакета ищутся двумя запросами, произведения и
+    строки GenreTitle вставляются через bulk_create.
+    """
+    checked, errors = validate_items(TitleBulkSerializer, items, context)
+    valid = {
+        index: serializer.validated_data
+        for index, serializer in enumerate(checked) if index not in errors
+    }
+    categories = dict(Category.objects.filter(
+        slug__in={data['category'] for data in valid.values()}
+    ).values_list('slug', 'pk'))
+    genres = dict(Genre.objects.filter(
+        slug__in={slug for data in valid.values() for slug in data['genre']}
+    ).values_list('slug', 'pk'))
+
+    titles = {}
+    for index, data in valid.items():
+        item_errors = {}
+        if data['category'] not in categories:
+            item_errors['category'] = [SLUG_NOT_FOUND.format(
+                slug_name='slug', value=data['category']
+            )]
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                SLUG_NOT_FOUND.format(slug_name='slug', value=slug)
+                for slug in missing
+            ]
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        titles[index] = Title(
+            name=data['name'],
+            year=data['year'],
+            description=data.get('description'),
+            category_id=categories[data['category']],
+        )
+
+    with transaction.atomic():
+        if connection.features.can_return_ids_from_bulk_insert:
+            Title.objects.bulk_create(titles.values())
+            bump_model_version(Title)
+        else:
+            # Без RETURNING ключи новых строк неизвестны.
+            for title in titles.values():
+                title.save()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title.pk, genre_id=genres[slug])
+            for index, title in titles.items()
+            for slug in dict.fromkeys(valid[index]['genre'])
+        )
+        bump_model_version(GenreTitle)
+
+    created = {
+        index: {'id': title.pk, **checked[index].data}
+        for index, title in titles.items()
+    }
+    return collect_results(checked, errors, created)
+
+
+def insert_reviews(reviews, errors):
+    """Вставляет обзоры пакетом, а при конфликте — по одному.
+
+    Если параллельный запрос успел оставить обзор на то же произведение,
+    пакет откатывается к точке сохранения, и обзоры вставляются каждый в
+    своей: проигравшие гонку помечаются ошибкой и удаляются из
+    ``reviews``, сколько бы конкурентов ни было.
+    """
+    try:
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews.values())
+        return
+    except IntegrityError:
+        pass
+    for index, review in list(reviews.items()):
+        try:
+            with transaction.atomic():
+                Review.objects.bulk_create([review])
+        except IntegrityError:
+            errors[index] = {'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]}
+            del reviews[index]
+
+
+def create_reviews(items, context):
+    """Создаёт обзоры текущего пользователя на разные произведения.
+
+    Существование произведений и ограничение ``unique_title_author``
+    проверяются двумя запросами на пакет; если параллельный запрос успел
+    оставить обзор раньше, конфликтующие элементы помечаются ошибкой
+    (см. insert_reviews). Рейтинги произведений сдвигаются
+    одним UPDATE, так как bulk_create не отправляет сигналов.
+    """
+    author = context['request'].user
+    checked, errors = validate_items(ReviewBulkSerializer, items, context)
+    valid = {
+        index: serializer.validated_data
+        for index, serializer in enumerate(checked) if index not in errors
+    }
+    title_ids = {data['title_id'] for data in valid.values()}
+    existing = set(Title.objects.filter(
+        pk__in=title_ids
+    ).values_list('pk', flat=True))
+    reviewed = set(Review.objects.filter(
+        author=author, title_id__in=title_ids
+    ).values_list('title_id', flat=True))
+
+    reviews = {}
+    for index, data in valid.items():
+        if data['title_id'] not in existing:
+            errors[index] = {
+                'title': [PK_NOT_FOUND.format(pk_value=data['title_id'])]
+            }
+        elif data['title_id'] in reviewed:
+            errors[index] = {'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]}
+        else:
+            reviewed.add(data['title_id'])
+            reviews[index] = Review(author=author, **data)
+
+    with transaction.atomic():
+        insert_reviews(reviews, errors)
+        if not connection.features.can_return_ids_from_bulk_insert:
+            # Ключи находятся по уникальной паре (произведение, автор).
+            ids = dict(Review.objects.filter(
+                author=author,
+                title_id__in=[review.title_id for review in reviews.values()],
+            ).values_list('title_id', 'pk'))
+            for review in reviews.values():
+                review.pk = ids[review.title_id]
+        shift_title_ratings({
+            review.title_id: {review.score: 1} for review in reviews.values()
+        })
+        bump_model_version(Review)
+
+    created = {
+        index: ReviewBulkSerializer(review, context=context).data
+        for index, review in reviews.items()
+    }
+    return collect_results(checked, errors, created)
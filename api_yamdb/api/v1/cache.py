@@ -0,0 +1,98 @@
+import hashlib
+
+from api.replica import primary_reads
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+VERSION_KEY = 'catalog:version:{label}'
+STATS_KEY = 'catalog:stats:{name}'
+
+
+def model_version_key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def increment(key, store=cache):
+    """Атомарно (насколько позволяет бэкенд) увеличивает счётчик в кэше."""
+    try:
+        return store.incr(key)
+    except ValueError:
+        if store.add(key, 1, timeout=None):
+            return 1
+        return store.incr(key)
+
+
+def bump_model_version(model):
+    """Сбрасывает кэш ответов, зависящих от модели, после коммита."""
+    transaction.on_commit(lambda: increment(model_version_key(model)))
+
+
+def get_stats():
+    """Счётчики попаданий и промахов кэша каталога."""
+    names = ('hits', 'misses')
+    values = cache.get_many([STATS_KEY.format(name=name) for name in names])
+    return {
+        name: values.get(STATS_KEY.format(name=name), 0) for name in names
+    }
+
+
+class VersionedCacheMixin:
+    """Кэширует ответы list до изменения зависимых моделей.
+
+    Ключ включает полный путь с параметрами запроса (а значит, и номер
+    страницы) и текущие версии моделей из ``cache_models``. Версии
+    увеличиваются сигналами сохранения и удаления этих моделей, поэтому
+    устаревшие записи не читаются и вытесняются по таймауту. Промах
+    заполняется чтением с основной БД: иначе отставшая реплика попала бы
+    в кэш под новой версией. При ``CATALOG_CACHE_ENABLED = False`` ответы
+    не кэшируются.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def get_cache_key(self, request):
+        version_keys = [
+            model_version_key(model) for model in self.cache_models
+        ]
+        versions = cache.get_many(version_keys)
+        version = '.'.join(str(versions.get(key, 0)) for key in version_keys)
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return (
+            f'catalog:response:{self.basename}:{self.action}:{version}:{url}'
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.CATALOG_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            increment(STATS_KEY.format(name='hits'))
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        increment(STATS_KEY.format(name='misses'))
+        with primary_reads():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class VersionedDetailCacheMixin(VersionedCacheMixin):
+    """То же для list и retrieve.
+
+    Только для наборов с RetrieveModelMixin: роутер открывает GET карточки
+    для любого набора с методом retrieve.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,83 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified на условные GET для list/retrieve.
+
+    Валидаторы считаются одним запросом к БД без сериализации: дата
+    последнего изменения (поле ``updated``) и, для списков, число строк.
+    ETag строится из них, полного пути запроса и формата ответа,
+    Last-Modified — из даты изменения. Для списков Last-Modified
+    отдаётся, только если удаление строки сдвигает дату родителя
+    (см. ``reviews.signals``), иначе ``get_list_validators`` возвращает
+    вместо даты None и остаётся один ETag.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_list_validators, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_object_validators, super().retrieve,
+            request, *args, **kwargs
+        )
+
+    def get_list_validators(self):
+        """Пара (дата для Last-Modified или None, состояние для ETag)."""
+        raise NotImplementedError
+
+    def get_validators_queryset(self):
+        """Набор объектов для валидаторов; без проверок родителей."""
+        return self.get_queryset()
+
+    def get_cached_validators(self, get_validators):
+        """Точка расширения для кэширования валидаторов."""
+        return get_validators()
+
+    def get_object_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        updated = (
+            self.get_validators_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list('updated', flat=True)
+            .first()
+        )
+        if updated is None:
+            return None
+        return updated, (updated,)
+
+    def get_etag(self, request, state):
+        source = ':'.join(
+            [*map(str, state), request.accepted_renderer.format,
+             request.get_full_path()]
+        )
+        return quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+    def conditional_response(self, get_validators, handler, request, *args,
+                             **kwargs):
+        validators = self.get_cached_validators(get_validators)
+        if validators is None:
+            # Объекта нет: обработчик сам ответит 404.
+            return handler(request, *args, **kwargs)
+        last_modified, state = validators
+        etag = self.get_etag(request, state)
+        timestamp = (
+            None if last_modified is None
+            else timegm(last_modified.utctimetuple())
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,132 @@
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from rest_framework import renderers, serializers
+from reviews.models import Review, Title
+
+from .serializers import TitleListSerializer, TitleRowsListSerializer
+
+TITLE_CSV_COLUMNS = (
+    'id', 'name', 'year', 'description', 'category', 'genre', 'rating',
+)
+REVIEW_CSV_COLUMNS = ('id', 'title', 'author', 'score', 'pub_date', 'text')
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Формат выгрузки NDJSON: по одному JSON-объекту в строке.
+
+    Выгрузку пишет генератор, рендерер нужен для выбора формата через
+    ``?format=`` и Accept и для ответов с ошибками.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json_line(data).encode()
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Формат выгрузки CSV; ошибка — строка заголовка и строка значений."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        return csv_lines([list(data), list(data.values())]).encode()
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def json_line(item):
+    return json.dumps(item, ensure_ascii=False) + '\n'
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    return ''.join(writer.writerow(row) for row in rows)
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def title_items(using):
+    """Произведения в представлении списка /titles/, порциями.
+
+    Строки читаются через ``iterator()`` (на PostgreSQL — серверным
+    курсором), жанры — одним запросом на порцию, поэтому в памяти не
+    больше ``EXPORT_CHUNK_SIZE`` произведений.
+    """
+    rows = Title.objects.using(using).order_by('pk').values(
+        *TitleRowsListSerializer.values
+    ).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    for chunk in chunks(rows, settings.EXPORT_CHUNK_SIZE):
+        yield TitleListSerializer(
+            chunk, many=True, context={'using': using}
+        ).data
+
+
+def review_items(using):
+    pub_date = serializers.DateTimeField()
+    rows = Review.objects.using(using).order_by('pk').values_list(
+        'id', 'title_id', 'author__username', 'score', 'pub_date', 'text'
+    ).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    for chunk in chunks(rows, settings.EXPORT_CHUNK_SIZE):
+        yield [
+            dict(zip(
+                REVIEW_CSV_COLUMNS,
+                (*row[:4], pub_date.to_representation(row[4]), row[5]),
+            ))
+            for row in chunk
+        ]
+
+
+def title_csv_row(item):
+    return (
+        item['id'], item['name'], item['year'], item['description'],
+        item['category'] and item['category']['slug'],
+        ','.join(genre['slug'] for genre in item['genre']),
+        item['rating'],
+    )
+
+
+def review_csv_row(item):
+    return tuple(item.values())
+
+
+EXPORTS = {
+    'titles': (title_items, TITLE_CSV_COLUMNS, title_csv_row),
+    'reviews': (review_items, REVIEW_CSV_COLUMNS, review_csv_row),
+}
+
+
+def export_lines(dataset, output_format, using):
+    """Строки выгрузки ``dataset`` в формате ``ndjson`` или ``csv``.
+
+    Каждая порция отдаётся одной строкой ответа, чтобы не отправлять
+    клиенту тысячи мелких фрагментов.
+    """
+    items, columns, csv_row = EXPORTS[dataset]
+    if output_format == CSVRenderer.format:
+        yield csv_lines([columns])
+        for chunk in items(using):
+            yield csv_lines(csv_row(item) for item in chunk)
+    else:
+        for chunk in items(using):
+            yield ''.join(json_line(item) for item in chunk)
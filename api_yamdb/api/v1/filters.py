@@ -1,5 +1,41 @@
 import django_filters
-from reviews.models import Title
+from api.v1.search import rank_by_similarity
+from django.conf import settings
+from django.db.models import Count
+from rest_framework import filters, serializers
+from reviews.models import Category, Genre, GenreTitle, Title
+
+MATCH_CHOICES = (('any', 'любой из жанров'), ('all', 'все жанры'))
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """Несколько значений через запятую: ``?genre=drama,comedy``."""
+
+
+class NumberInFilter(django_filters.BaseInFilter,
+                     django_filters.NumberFilter):
+    """Несколько чисел через запятую: ``?ids=1,2,3``."""
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """SearchFilter с необязательным ранжированием по сходству.
+
+    Поиск по подстроке на PostgreSQL использует GIN-индексы pg_trgm.
+    С параметром ``?rank=true`` результаты сортируются по убыванию
+    триграммного сходства с первым полем из ``search_fields``.
+    """
+
+    rank_param = 'rank'
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        rank = request.query_params.get(self.rank_param, '').lower()
+        if rank not in ('1', 'true'):
+            return queryset
+        field = getattr(view, 'search_fields', ())[0]
+        return rank_by_similarity(
+            queryset, field, ' '.join(self.get_search_terms(request))
+        )
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -7,11 +43,69 @@ class TitleFilter(django_filters.FilterSet):
                                      lookup_expr='icontains')
     year = django_filters.NumberFilter(field_name='year',
                                        lookup_expr='exact')
-    category = django_filters.CharFilter(field_name='category__slug',
-                                         lookup_expr='icontains')
-    genre = django_filters.CharFilter(field_name='genre__slug',
-                                      lookup_expr='icontains')
+    category = CharInFilter(method='filter_category')
+    category_contains = django_filters.CharFilter(
+        method='filter_category_contains'
+    )
+    genre = CharInFilter(method='filter_genre')
+    genre_contains = django_filters.CharFilter(method='filter_genre_contains')
+    genre_match = django_filters.ChoiceFilter(
+        choices=MATCH_CHOICES, method='skip_filter'
+    )
+    rank = django_filters.BooleanFilter(method='rank_by_name')
+    ids = NumberInFilter(method='filter_ids')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'category', 'genre']
+
+    def skip_filter(self, queryset, name, value):
+        return queryset
+
+    def filter_ids(self, queryset, name, value):
+        value = [pk for pk in value if pk is not None]
+        if len(value) > settings.MULTI_GET_MAX_IDS:
+            raise serializers.ValidationError({
+                name: f'Не более {settings.MULTI_GET_MAX_IDS} id за запрос.'
+            })
+        # Представление отдаёт выборку без страниц, только если она была.
+        self.request.multi_get_ids = value
+        return queryset.filter(pk__in=value)
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category__in=Category.objects.filter(
+            slug__in=value
+        ).values('pk'))
+
+    def filter_category_contains(self, queryset, name, value):
+        return queryset.filter(category__in=Category.objects.filter(
+            slug__icontains=value
+        ).values('pk'))
+
+    def filter_genre(self, queryset, name, value):
+        """Точное совпадение slug жанра через подзапрос, без JOIN.
+
+        Подзапрос по GenreTitle не размножает строки произведений.
+        При ``genre_match=all`` произведение должно иметь все жанры.
+        """
+        slugs = set(value)
+        links = GenreTitle.objects.filter(
+            genre__in=Genre.objects.filter(slug__in=slugs).values('pk')
+        ).values('title_id')
+        if self.form.cleaned_data.get('genre_match') == 'all':
+            links = links.annotate(
+                matched=Count('genre_id', distinct=True)
+            ).filter(matched=len(slugs)).values('title_id')
+        return queryset.filter(pk__in=links)
+
+    def filter_genre_contains(self, queryset, name, value):
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__in=Genre.objects.filter(
+                slug__icontains=value
+            ).values('pk')
+        ).values('title_id'))
+
+    def rank_by_name(self, queryset, name, value):
+        if not value:
+            return queryset
+        return rank_by_similarity(queryset, 'name', self.data.get('name'))
@@ -0,0 +1,41 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Курсорная пагинация: без COUNT(*) и OFFSET, по индексу."""
+
+    ordering = '-id'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """Постраничная пагинация с опциональным курсорным режимом.
+
+    Курсорный режим включается параметром ``?cursor=`` (в том числе
+    пустым для первой страницы). Порядок обхода задаётся атрибутом
+    ``cursor_ordering`` представления и должен опираться на индекс.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = '-id'
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = KeysetCursorPagination(
+            getattr(view, 'cursor_ordering', self.cursor_ordering)
+        )
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
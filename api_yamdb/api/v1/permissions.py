@@ -14,7 +14,7 @@ class IsAuthorAdminModeratorOrReadOnly(permissions.BasePermission):
         if request.method == 'POST':
             return request.user.is_authenticated
         return request.user.is_authenticated and (
-            request.user == obj.author
+            obj.author_id == request.user.pk
             or request.user.is_moderator
             or request.user.is_admin
         )
@@ -0,0 +1,27 @@
+from functools import lru_cache
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+
+
+@lru_cache(maxsize=None)
+def trigram_available(alias):
+    """Установлено ли расширение pg_trgm в базе ``alias``."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def rank_by_similarity(queryset, field, value):
+    """Сортирует по триграммному сходству ``field`` со строкой ``value``.
+
+    Без pg_trgm (например, на SQLite в тестах) порядок не меняется.
+    """
+    if not value or not trigram_available(queryset.db):
+        return queryset
+    return queryset.annotate(
+        similarity=TrigramSimilarity(field, value)
+    ).order_by('-similarity', field, 'pk')
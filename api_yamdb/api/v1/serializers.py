@@ -1,31 +1,115 @@
+from api.middleware import ProfiledSerializerMixin, profiled_serialization
 from rest_framework import serializers
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
 from users.models import User
 
+DUPLICATE_REVIEW_MESSAGE = (
+    'Публиковать более одного обзора на одно и то же произведение нельзя!'
+)
 
-class GenreSerializer(serializers.ModelSerializer):
+
+class ProfiledModelSerializer(ProfiledSerializerMixin,
+                              serializers.ModelSerializer):
+    """ModelSerializer, время которого попадает в профиль запроса."""
+
+
+class GenreSerializer(ProfiledModelSerializer):
     class Meta:
         model = Genre
         exclude = ('id',)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ProfiledModelSerializer):
     class Meta:
         model = Category
         exclude = ('id',)
 
 
-class TitleGetSerializer(serializers.ModelSerializer):
+class TitleGetSerializer(ProfiledModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
-    rating = serializers.IntegerField(default=0)
+    rating = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Title
+        fields = (
+            'id', 'category', 'genre', 'rating', 'name', 'year', 'description'
+        )
+
+
+class TitleRowsListSerializer(serializers.ListSerializer):
+    """Список произведений из строк ``.values()`` без полей DRF.
+
+    Вложенные сериализаторы и ``to_representation`` каждого поля на
+    каждой строке заметно нагружают CPU на больших страницах. Здесь
+    словари собираются напрямую, а жанры страницы читаются одним
+    запросом. Результат совпадает с TitleGetSerializer(many=True) вплоть
+    до порядка ключей.
+    """
+
+    values = (
+        'id', 'name', 'year', 'description', 'score_sum', 'review_count',
+        'category__name', 'category__slug',
+    )
+
+    @profiled_serialization
+    def to_representation(self, data):
+        rows = list(data)
+        genres = {row['id']: [] for row in rows}
+        # Порядок жанров тот же, что у prefetch_related('genre').
+        genre_titles = GenreTitle.objects.db_manager(self.context.get('using'))
+        for title_id, name, slug in genre_titles.filter(
+            title_id__in=genres
+        ).order_by('genre__name').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            genres[title_id].append({'name': name, 'slug': slug})
+        return [
+            {
+                'id': row['id'],
+                'category': None if row['category__slug'] is None else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                },
+                'genre': genres[row['id']],
+                'rating': int(row['score_sum'] / row['review_count'])
+                if row['review_count'] else None,
+                'name': row['name'],
+                'year': row['year'],
+                'description': row['description'],
+            }
+            for row in rows
+        ]
+
+
+class TitleListSerializer(TitleGetSerializer):
+    """TitleGetSerializer для списков из строк ``TitleRowsListSerializer``."""
+
+    class Meta(TitleGetSerializer.Meta):
+        list_serializer_class = TitleRowsListSerializer
+
+
+class ScoreDistributionSerializer(ProfiledModelSerializer):
+    """Распределение оценок по счётчикам произведения.
+
+    ``mean`` и ``rating`` берутся из той же строки, что и распределение,
+    и совпадают с рейтингом в TitleGetSerializer.
+    """
+
+    count = serializers.IntegerField(source='review_count', read_only=True)
+    mean = serializers.FloatField(source='rating', read_only=True)
+    rating = serializers.IntegerField(read_only=True)
+    distribution = serializers.DictField(
+        source='score_distribution', child=serializers.IntegerField(),
+        read_only=True,
+    )
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'count', 'mean', 'rating', 'distribution')
 
 
-class TitlePostSerializer(serializers.ModelSerializer):
+class TitlePostSerializer(ProfiledModelSerializer):
     category = serializers.SlugRelatedField(
         queryset=Category.objects.all(), slug_field='slug'
     )
@@ -39,7 +123,14 @@ class TitlePostSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'description', 'category', 'genre', 'year')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkSerializer(TitlePostSerializer):
+    """Произведение в пакете: слаги проверяются сразу для всего пакета."""
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+
+class ReviewSerializer(ProfiledModelSerializer):
 
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
@@ -49,22 +140,21 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        if self.context['request'].method == 'POST':
-            title_id = self.context['request'].parser_context['kwargs'][
-                'title_id'
-            ]
-            if Review.objects.filter(
-                author=self.context['request'].user, title_id=title_id
-            ).exists():
-                raise serializers.ValidationError(
-                    'Публиковать более одного обзора на одно и то же'
-                    ' произведение нельзя!'
-                )
-        return data
+
+class ReviewBulkSerializer(ProfiledModelSerializer):
+    """Обзор в пакете: произведение и уникальность проверяются пакетом."""
+
+    title = serializers.IntegerField(source='title_id', min_value=1)
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ProfiledModelSerializer):
 
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
@@ -75,7 +165,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ProfiledModelSerializer):
     forbidden_usernames = ('me', 'admin', 'superuser')
     default_error_messages = {
         'forbidden_username': 'Имя `{name}` запрещено к использованию.',
@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from .authentication import user_cache
+from .cache import bump_model_version
+
+CATALOG_MODELS = (Category, Genre, Title, GenreTitle, Review)
+
+
+def catalog_changed(sender, **kwargs):
+    bump_model_version(sender)
+
+
+# Обработчик без отправителя слушал бы все модели, и Django не удалял бы
+# каскадом одним запросом, например, комментарии удаляемых обзоров.
+for model in CATALOG_MODELS:
+    post_save.connect(catalog_changed, sender=model)
+    post_delete.connect(catalog_changed, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_model_version(GenreTitle)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    user_cache.delete(instance.pk)
@@ -0,0 +1,131 @@
+import hashlib
+from collections.abc import Mapping
+
+from api.v1.cache import increment
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+THROTTLE_CACHE = 'throttle'
+REJECTED_KEY = 'throttle:rejected:{scope}'
+
+
+def get_throttle_stats():
+    """Число отклонённых запросов по каждой области ограничения."""
+    scopes = list(api_settings.DEFAULT_THROTTLE_RATES)
+    values = caches[THROTTLE_CACHE].get_many(
+        [REJECTED_KEY.format(scope=scope) for scope in scopes]
+    )
+    return {
+        scope: values.get(REJECTED_KEY.format(scope=scope), 0)
+        for scope in scopes
+    }
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов по алгоритму token bucket.
+
+    Область — ``throttle_scope`` представления с суффиксом класса,
+    например ``signup-ip``; частота ``число/период`` берётся из
+    ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``. В ведре помещается
+    ``число`` запросов, и оно равномерно пополняется за ``период``, так
+    что короткий всплеск проходит, а длинная серия упирается в частоту.
+
+    Жетон появляется раз в ``период / число`` секунд, и в ведре лежат
+    только ``число`` последних. Запрос забирает свободный жетон записью
+    его ключа через ``cache.add``: запись атомарна и в DatabaseCache, так
+    что одновременные запросы из разных воркеров не получат один жетон.
+    Жетоны хранятся в кэше ``throttle``, общем для воркеров.
+    """
+
+    scope_suffix = None
+
+    def __init__(self):
+        # Частота зависит от представления и определяется в allow_request.
+        self.next_token_at = self.now = 0
+
+    @property
+    def cache(self):
+        return caches[THROTTLE_CACHE]
+
+    def get_rate(self):
+        # Настройки читаются при каждой проверке, а не при импорте, как в
+        # SimpleRateThrottle, чтобы изменение частот не требовало перезапуска.
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'Не задана частота для области {self.scope}'
+            )
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+        self.scope = f'{scope}-{self.scope_suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        if self.take_token():
+            return True
+        increment(REJECTED_KEY.format(scope=self.scope), self.cache)
+        return False
+
+    def take_token(self):
+        """Забирает самый старый свободный жетон ведра."""
+        interval = self.duration / self.num_requests
+        self.now = self.timer()
+        last = int(self.now // interval)
+        self.next_token_at = (last + 1) * interval
+        keys = [
+            f'{self.key}:{token}'
+            for token in range(last - self.num_requests + 1, last + 1)
+        ]
+        taken = self.cache.get_many(keys)
+        # Через duration секунд жетон выпадает из ведра, дольше хранить
+        # запись незачем. Если жетон успел забрать другой запрос, add
+        # вернёт False, и берётся следующий.
+        return any(
+            self.cache.add(key, True, self.duration)
+            for key in keys if key not in taken
+        )
+
+    def wait(self):
+        return self.next_token_at - self.now
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Ведро на адрес клиента с учётом ``NUM_PROXIES``."""
+
+    scope_suffix = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class UsernameTokenBucketThrottle(TokenBucketThrottle):
+    """Ведро на имя пользователя из тела запроса, с любого адреса."""
+
+    scope_suffix = 'username'
+
+    def get_ident_value(self, request):
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return hashlib.md5(username.strip().lower().encode()).hexdigest()
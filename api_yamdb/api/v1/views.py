@@ -1,33 +1,55 @@
-from api.v1.filters import TitleFilter
+from api.replica import primary_reads
+from api.v1.authentication import add_user_claims
+from api.v1.bulk import (bulk_items, bulk_response, create_reviews,
+                         create_titles)
+from api.v1.cache import (VersionedCacheMixin, VersionedDetailCacheMixin,
+                          get_stats)
+from api.v1.conditional import ConditionalGetMixin
+from api.v1.export import CSVRenderer, NDJSONRenderer, export_lines
+from api.v1.filters import TitleFilter, TrigramSearchFilter
+from api.v1.pagination import PageNumberOrCursorPagination
 from api.v1.permissions import (AdminOnlyPermission,
                                 IsAdminOrReadOnlyPermission,
                                 IsAuthorAdminModeratorOrReadOnly)
-from api.v1.serializers import (CategorySerializer, CommentSerializer,
+from api.v1.serializers import (DUPLICATE_REVIEW_MESSAGE, CategorySerializer,
+                                CommentSerializer,
                                 ConfirmationCodeTokenSerializer,
                                 GenreSerializer, ReviewSerializer,
+                                ScoreDistributionSerializer,
                                 SelfUserSerializer, TitleGetSerializer,
-                                TitlePostSerializer, UserSerializer)
+                                TitleListSerializer, TitlePostSerializer,
+                                TitleRowsListSerializer, UserSerializer)
+from api.v1.throttling import (IPTokenBucketThrottle,
+                               UsernameTokenBucketThrottle, get_throttle_stats)
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.core.cache import cache
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F, Max, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import (filters, generics, mixins, pagination, permissions,
-                            serializers, status, viewsets)
+from rest_framework import (generics, mixins, pagination, permissions,
+                            serializers, status, views, viewsets)
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.views import TokenViewBase
-from reviews.models import Category, Genre, Review, Title
-from users.models import User
+from reviews.models import (SCORES, Category, Comment, Genre, GenreTitle,
+                            LeaderboardEntry, Review, Title)
+from users.models import OutboxEmail, User
 
+from api_yamdb.pool import connection_stats
 from api_yamdb.settings import DEFAULT_SENDER_EMAIL
 
 
 class CreateListDestroyViewSet(
+    VersionedCacheMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -35,7 +57,7 @@ class CreateListDestroyViewSet(
 ):
     permission_classes = [IsAdminOrReadOnlyPermission]
     lookup_field = 'slug'
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (TrigramSearchFilter,)
     search_fields = ('name',)
     pagination_class = PageNumberPagination
 
@@ -43,51 +65,192 @@ class CreateListDestroyViewSet(
 class CategoryViewSet(CreateListDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
 
 class GenreViewSet(CreateListDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalGetMixin, VersionedDetailCacheMixin, viewsets.ModelViewSet
+):
     permission_classes = [IsAdminOrReadOnlyPermission]
-    pagination_class = PageNumberPagination
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-        'name'
+    cache_models = (Title, Category, Genre, GenreTitle, Review)
+    pagination_class = PageNumberOrCursorPagination
+    # Курсор DRF хранит значение только первого поля порядка, а названия
+    # повторяются: при равных названиях страницы сдвигаются смещением и
+    # теряют или повторяют строки при вставках. id уникален и в индексе.
+    cursor_ordering = 'id'
+    queryset = (
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
+        .order_by('name')
     )
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
+    def get_queryset(self):
+        if self.action == 'list':
+            # Список строится из строк .values(): TitleRowsListSerializer.
+            return Title.objects.order_by('name').values(
+                *TitleRowsListSerializer.values
+            )
+        return super().get_queryset()
+
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action == 'list':
+            return TitleListSerializer
+        if self.action == 'retrieve':
             return TitleGetSerializer
         return TitlePostSerializer
 
+    def get_list_validators(self):
+        # Удалённое произведение не сдвигает ничью дату, поэтому только ETag.
+        stats = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last=Max('updated'), count=Count('pk')
+        )
+        return None, (stats['last'], stats['count'])
+
+    def paginate_queryset(self, queryset):
+        if 'ids' in self.request.query_params:
+            # Выборка по id отдаётся целиком, без страниц. Пустой ?ids=
+            # фильтр пропускает, и без проверки вернулся бы весь каталог.
+            if not getattr(self.request, 'multi_get_ids', None):
+                raise serializers.ValidationError(
+                    {'ids': 'Укажите id произведений через запятую.'}
+                )
+            return None
+        return super().paginate_queryset(queryset)
+
+    @action(detail=True, url_path='score-distribution')
+    def score_distribution(self, request: Request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only(
+                'score_sum', 'review_count',
+                *map(Title.score_count_field, SCORES),
+            ),
+            pk=pk,
+        )
+        return Response(ScoreDistributionSerializer(title).data)
+
+    @action(detail=False)
+    def top(self, request: Request):
+        """Лучшие произведения: все, ``?category=`` или ``?genre=``.
+
+        Места берутся из рейтингов, которые пересчитывает
+        refresh_leaderboards, сами произведения — в текущем состоянии.
+        ``?limit=`` — число мест, не больше LEADERBOARD_SIZE.
+        """
+        board, slug = self.get_leaderboard(request.query_params)
+        limit = serializers.IntegerField(
+            min_value=1, max_value=settings.LEADERBOARD_SIZE
+        )
+        try:
+            limit = limit.run_validation(request.query_params.get('limit', 10))
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({'limit': error.detail})
+        rows = Title.objects.filter(
+            leaderboard_entries__board=board, leaderboard_entries__slug=slug
+        ).order_by('leaderboard_entries__position').values(
+            *TitleRowsListSerializer.values
+        )[:limit]
+        return Response(TitleListSerializer(
+            rows, many=True, context=self.get_serializer_context()
+        ).data)
+
+    def get_leaderboard(self, params):
+        boards = [
+            (board, params[board])
+            for board in (LeaderboardEntry.CATEGORY, LeaderboardEntry.GENRE)
+            if board in params
+        ]
+        if len(boards) > 1:
+            raise serializers.ValidationError(
+                'Укажите категорию или жанр, но не оба сразу.'
+            )
+        return boards[0] if boards else (LeaderboardEntry.ALL, '')
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(methods=['post'], detail=False)
+    def bulk(self, request: Request):
+        results = create_titles(
+            bulk_items(request), self.get_serializer_context()
+        )
+        return bulk_response(results)
+
+    def get_cached_validators(self, get_validators):
+        if not settings.CATALOG_CACHE_ENABLED:
+            return get_validators()
+        # Версии моделей в ключе кэша сбрасывают и валидаторы.
+        key = f'{self.get_cache_key(self.request)}:validators'
+        validators = cache.get(key)
+        if validators is None:
+            with primary_reads():
+                validators = get_validators()
+            if validators is not None:
+                cache.set(key, validators, settings.CATALOG_CACHE_TIMEOUT)
+        return validators
+
+
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorAdminModeratorOrReadOnly,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrCursorPagination
     serializer_class = ReviewSerializer
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        serializer.save(title=title, author=self.request.user)
+        """Сохраняет обзор без предварительных проверок.
+
+        Повторный обзор отклоняет ограничение ``unique_title_author``,
+        в том числе при одновременных запросах, а отсутствие произведения
+        обнаруживает сдвиг его рейтинга. Вставка и сдвиг рейтинга идут в
+        одной транзакции Review.save, которая откатывается при ошибке.
+        """
+        title_id = int(self.kwargs.get('title_id'))
+        try:
+            serializer.save(title_id=title_id, author=self.request.user)
+        except Title.DoesNotExist:
+            raise Http404
+        except IntegrityError:
+            # На СУБД с немедленной проверкой внешних ключей сюда же
+            # попадает обзор несуществующего произведения.
+            if not Title.objects.filter(pk=title_id).exists():
+                raise Http404
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]
+            })
 
     def get_queryset(self):
         title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return title.reviews.select_related('author')
+
+    def get_list_validators(self):
+        # Создание и удаление обзора сдвигает дату изменения произведения.
+        state = (
+            Title.objects.filter(pk=self.kwargs.get('title_id'))
+            .annotate(last_review=Max('reviews__updated'))
+            .order_by()
+            .values_list('updated', 'last_review', 'review_count')
+            .first()
+        )
+        if state is None:
+            return None
+        return max(filter(None, state[:2])), state
 
+    def get_validators_queryset(self):
+        return Review.objects.filter(title_id=self.kwargs.get('title_id'))
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorAdminModeratorOrReadOnly,
     )
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrCursorPagination
 
     serializer_class = CommentSerializer
 
@@ -96,45 +259,203 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(review=review, author=self.request.user)
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
         review = get_object_or_404(
-            title.reviews.all(), pk=self.kwargs.get('review_id')
+            Review.objects.only('pk'),
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
+        return review.comments.select_related('author')
+
+    def get_list_validators(self):
+        # Удаление комментария и переименование автора сдвигают даты
+        # изменения обзора и комментариев (Comment.delete, reviews.signals).
+        state = (
+            Review.objects.filter(
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+            .annotate(
+                last_comment=Max('comments__updated'),
+                comment_count=Count('comments'),
+            )
+            .order_by()
+            .values_list('updated', 'last_comment', 'comment_count')
+            .first()
+        )
+        if state is None:
+            return None
+        return max(filter(None, state[:2])), state
+
+    def get_validators_queryset(self):
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
+
+
+class LatestReviewsView(generics.ListAPIView):
+    """Последние обзоры нескольких произведений за два запроса к БД.
+
+    ``?titles=1,2,3&limit=3`` — не более ``limit`` новых обзоров на каждое
+    произведение. Номер обзора внутри произведения считается оконной
+    функцией ROW_NUMBER() во вложенном запросе, авторы догружаются
+    вторым запросом.
+    """
+
+    serializer_class = ReviewSerializer
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = None
+    default_limit = 3
+    max_limit = 20
+
+    def get_title_ids(self):
+        raw = self.request.query_params.get('titles', '')
+        try:
+            title_ids = list(dict.fromkeys(
+                int(value) for value in raw.split(',') if value
+            ))
+        except ValueError:
+            title_ids = None
+        if not title_ids:
+            raise serializers.ValidationError(
+                {'titles': 'Укажите id произведений через запятую.'}
+            )
+        if len(title_ids) > settings.MULTI_GET_MAX_IDS:
+            raise serializers.ValidationError({
+                'titles': f'Не более {settings.MULTI_GET_MAX_IDS} id '
+                          f'за запрос.'
+            })
+        return title_ids
+
+    def get_limit(self):
+        field = serializers.IntegerField(min_value=1, max_value=self.max_limit)
+        try:
+            return field.run_validation(
+                self.request.query_params.get('limit', self.default_limit)
+            )
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({'limit': error.detail})
+
+    def get_queryset(self):
+        ranked = Review.objects.filter(
+            title_id__in=self.title_ids
+        ).annotate(position=Window(
+            RowNumber(),
+            partition_by=[F('title_id')],
+            order_by=[F('pub_date').desc(), F('id').desc()],
+        )).order_by()
+        sql, params = ranked.query.sql_with_params()
+        reviews = list(Review.objects.raw(
+            f'SELECT * FROM ({sql}) ranked WHERE ranked.position <= %s '
+            f'ORDER BY ranked.title_id, ranked.position',
+            (*params, self.limit),
+        ))
+        prefetch_related_objects(reviews, 'author')
+        return reviews
+
+    def list(self, request, *args, **kwargs):
+        self.title_ids = self.get_title_ids()
+        self.limit = self.get_limit()
+        grouped = {title_id: [] for title_id in self.title_ids}
+        for review in self.get_queryset():
+            grouped[review.title_id].append(review)
+        return Response([
+            {
+                'title': title_id,
+                'reviews': self.get_serializer(reviews, many=True).data,
+            }
+            for title_id, reviews in grouped.items()
+        ])
+
+
+class ReviewBulkView(views.APIView):
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request: Request):
+        results = create_reviews(
+            bulk_items(request), {'request': request, 'view': self}
+        )
+        return bulk_response(results)
+
+
+class CatalogCacheStatsView(views.APIView):
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request: Request):
+        return Response(get_stats())
+
+
+class DatabaseStatsView(views.APIView):
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request: Request):
+        return Response(connection_stats())
+
+
+class ThrottleStatsView(views.APIView):
+    permission_classes = [AdminOnlyPermission]
+
+    def get(self, request: Request):
+        return Response(get_throttle_stats())
+
+
+class CatalogExportView(views.APIView):
+    """Потоковая выгрузка всех произведений или обзоров для аналитики.
+
+    Формат выбирается параметром ``?format=ndjson`` (по умолчанию) или
+    ``?format=csv``. Произведения выгружаются в том же представлении, что
+    и в списке /titles/. Чтение идёт с той же БД, что и у остальных
+    безопасных запросов, и не держит в памяти больше одной порции.
+    """
+
+    permission_classes = [AdminOnlyPermission]
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def get(self, request: Request, dataset):
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            export_lines(dataset, renderer.format, router.db_for_read(Title)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{renderer.format}"'
         )
-        return review.comments.all()
+        return response
 
 
 class SignUpView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = 'signup'
     email_subject = 'Confirmation code'
     email_message = (
         'Привет, {username}! Регистрация на YaMDB успешна выполнена. '
         'Твой код подтверждения для входа: {code}. '
     )
 
-    def send_confirmation_code(self, user: User, code: int):
-        send_mail(
+    def queue_confirmation_code(self, user: User, code: str):
+        OutboxEmail.objects.create(
             subject=self.email_subject,
             message=self.email_message.format(
                 username=user.username, code=code
             ),
-            recipient_list=[user.email],
+            recipient=user.email,
             from_email=DEFAULT_SENDER_EMAIL,
         )
 
     def post(self, request: Request):
-        response = super().post(request)
-
-        user: User = get_object_or_404(
-            User, username=response.data['username']
-        )
-        code = default_token_generator.make_token(user)
-        self.send_confirmation_code(user, code)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            user: User = serializer.save()
+            code = default_token_generator.make_token(user)
+            self.queue_confirmation_code(user, code)
 
         data = {
-            'username': response.data['username'],
-            'email': response.data['email'],
+            'username': user.username,
+            'email': user.email,
         }
         return Response(data, status=status.HTTP_200_OK)
 
@@ -142,6 +463,8 @@ class SignUpView(generics.CreateAPIView):
 class ConfirmationCodeTokenView(TokenViewBase):
     serializer_class = ConfirmationCodeTokenSerializer
     token_class = AccessToken
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = 'token'
     error_message = {
         'invalid_code': (
             'Нет активных аккаунтов с таким кодом подтверждения. '
@@ -150,7 +473,7 @@ class ConfirmationCodeTokenView(TokenViewBase):
 
     @classmethod
     def get_token(cls, user):
-        return cls.token_class.for_user(user)
+        return add_user_claims(cls.token_class.for_user(user), user)
 
     def post(self, request, *args, **kwargs):
         serializer: serializers.Serializer = self.get_serializer(
@@ -187,6 +510,9 @@ class UsersViewSet(viewsets.ModelViewSet):
     )
     def me(self, request: Request):
         instance = self.request.user
+        if instance.get_deferred_fields():
+            # Пользователь из токена: догружаем профиль одним запросом.
+            instance.refresh_from_db()
 
         if request.method == 'GET':
             serializer = self.get_serializer(instance)
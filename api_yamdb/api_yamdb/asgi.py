@@ -2,15 +2,25 @@
 ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Django 2.2 has no ASGI handler of its own, so the WSGI handler is served
+through api_yamdb.asgi_handler:
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+    gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornH11Worker
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+from api_yamdb.asgi_handler import ThreadPoolAsgiHandler
+from api_yamdb.warmup import warm_up
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = ThreadPoolAsgiHandler(
+    get_wsgi_application(),
+    threads=settings.ASGI_THREADS,
+    hot_read_threads=settings.ASGI_HOT_READ_THREADS,
+)
+warm_up()
@@ -0,0 +1,150 @@
+"""ASGI-обработчик для Django 2.2 с ограниченными пулами потоков.
+
+Django 2.2 не умеет асинхронных представлений, поэтому ORM и DRF
+работают в потоках, а в цикле событий остаётся только ввод-вывод:
+чтение тела запроса и отправка ответа. Медленный клиент не занимает
+поток, пока передаёт запрос или забирает ответ. Горячие GET-эндпоинты
+(``HOT_READ_PATHS``) обслуживаются отдельным пулом, чтобы их не вытесняли
+запись и тяжёлые выгрузки.
+"""
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from asgiref.wsgi import WsgiToAsgiInstance
+
+HOT_READ_PATHS = re.compile(
+    r'^/api/v1/titles/(\d+/)?$|^/api/v1/titles/\d+/reviews/$'
+)
+BODY_MEMORY_LIMIT = 65536
+
+
+class WsgiResponse:
+    """Ответ WSGI-приложения, собранный в потоке пула."""
+
+    def __init__(self):
+        self.status = None
+        self.headers = []
+        self.chunks = []
+
+    def start_response(self, status, headers, exc_info=None):
+        if exc_info and self.status is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [
+            (name.lower().encode('latin1'), value.encode('latin1'))
+            for name, value in headers
+        ]
+
+
+class ThreadPoolAsgiHandler:
+    """ASGI-приложение поверх WSGI-обработчика Django."""
+
+    def __init__(self, wsgi_application, threads, hot_read_threads):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            threads, thread_name_prefix='asgi'
+        )
+        self.hot_read_executor = ThreadPoolExecutor(
+            hot_read_threads, thread_name_prefix='asgi-read'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(
+                f'Неподдерживаемый тип соединения {scope["type"]}'
+            )
+        with SpooledTemporaryFile(max_size=BODY_MEMORY_LIMIT) as body:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            await self.respond(scope, body, send)
+
+    def get_executor(self, scope):
+        if scope['method'] in ('GET', 'HEAD') and HOT_READ_PATHS.match(
+            scope['path']
+        ):
+            return self.hot_read_executor
+        return self.executor
+
+    async def respond(self, scope, body, send):
+        loop = asyncio.get_event_loop()
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = await loop.run_in_executor(
+            self.get_executor(scope), self.run_application,
+            scope, body, send_from_thread,
+        )
+        if response is None:
+            return
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': response.headers,
+        })
+        for chunk in response.chunks:
+            await send({
+                'type': 'http.response.body', 'body': chunk,
+                'more_body': True,
+            })
+        await send({'type': 'http.response.body'})
+
+    def run_application(self, scope, body, send_from_thread):
+        """Выполняет Django в потоке пула.
+
+        Обычный ответ собирается целиком и закрывается здесь же, чтобы
+        сигнал request_finished закрыл соединения с БД этого потока; его
+        отправляет цикл событий. Потоковый ответ (например, выгрузка с
+        серверным курсором) должен читаться в том же потоке, поэтому
+        поток сам отправляет его фрагменты и занят до конца передачи.
+        """
+        adapter = WsgiToAsgiInstance(self.wsgi_application)
+        adapter.scope = scope
+        environ = adapter.build_environ(scope, body)
+        # Тело уже прочитано целиком; у запросов с Transfer-Encoding:
+        # chunked нет Content-Length, без которого Django тело не читает.
+        environ['CONTENT_LENGTH'] = str(body.tell())
+        body.seek(0)
+        response = WsgiResponse()
+        result = self.wsgi_application(environ, response.start_response)
+        try:
+            if not getattr(result, 'streaming', False):
+                response.chunks = [chunk for chunk in result if chunk]
+                return response
+            send_from_thread({
+                'type': 'http.response.start',
+                'status': response.status,
+                'headers': response.headers,
+            })
+            for chunk in result:
+                send_from_thread({
+                    'type': 'http.response.body', 'body': chunk,
+                    'more_body': True,
+                })
+            send_from_thread({'type': 'http.response.body'})
+            return None
+        finally:
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                self.hot_read_executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
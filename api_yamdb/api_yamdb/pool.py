@@ -0,0 +1,174 @@
+import threading
+from collections import deque
+
+from django.db import OperationalError, connections
+
+# Пулы процесса по алиасам БД; создаются при первом подключении.
+pools = {}
+pools_lock = threading.Lock()
+
+
+class PoolTimeoutError(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """Ограниченный пул соединений DB-API, общий для потоков процесса.
+
+    Одновременно открыто не больше ``size`` соединений. Поток, которому
+    не хватило соединения, ждёт до ``timeout`` секунд, затем получает
+    PoolTimeoutError. ``check`` проверяет соединение, взятое из пула;
+    непригодные закрываются и заменяются новыми.
+    """
+
+    def __init__(self, size, timeout, check=None):
+        self.size = size
+        self.timeout = timeout
+        self.check = check
+        self.idle = deque()
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.waits = 0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+
+    def has_room(self):
+        return bool(self.idle) or self.in_use + len(self.idle) < self.size
+
+    def acquire(self, connect):
+        with self.condition:
+            if not self.has_room():
+                self.waits += 1
+                if not self.condition.wait_for(self.has_room, self.timeout):
+                    self.timeouts += 1
+                    raise PoolTimeoutError(
+                        f'Нет свободных соединений за {self.timeout} с '
+                        f'(размер пула {self.size})'
+                    )
+            self.in_use += 1
+            connection = self.idle.pop() if self.idle else None
+        if connection is not None and self.usable(connection):
+            return connection
+        try:
+            connection = connect()
+        except Exception:
+            self.release(None)
+            raise
+        with self.condition:
+            self.created += 1
+        return connection
+
+    def usable(self, connection):
+        if not connection.closed and (self.check is None
+                                      or self.check(connection)):
+            return True
+        self.discard(connection)
+        return False
+
+    def discard(self, connection):
+        with self.condition:
+            self.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def release(self, connection):
+        """Возвращает соединение в пул; None только освобождает место."""
+        if connection is not None and connection.closed:
+            self.discard(connection)
+            connection = None
+        with self.condition:
+            self.in_use -= 1
+            if connection is not None:
+                self.idle.append(connection)
+            self.condition.notify()
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'in_use': self.in_use,
+                'idle': len(self.idle),
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'created': self.created,
+                'discarded': self.discarded,
+            }
+
+
+def get_pool(alias, settings_dict, check=None):
+    with pools_lock:
+        if alias not in pools:
+            pool_settings = settings_dict.get('POOL', {})
+            pools[alias] = ConnectionPool(
+                size=pool_settings.get('SIZE', 10),
+                timeout=pool_settings.get('TIMEOUT', 10),
+                check=check,
+            )
+        return pools[alias]
+
+
+def connection_stats():
+    """Настройки соединений и статистика пулов по алиасам БД."""
+    stats = {}
+    for connection in connections.all():
+        alias = connection.alias
+        stats[alias] = {
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': bool(
+                connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            ),
+            'pool': pools[alias].stats() if alias in pools else None,
+        }
+    return stats
+
+
+def close_broken(connection):
+    # Сначала закрываем сам DB-API-объект, чтобы пул его не вернул.
+    try:
+        connection.connection.close()
+    except Exception:
+        pass
+    connection.close()
+
+
+def checked_ensure_connection(connection, ensure_connection):
+    """ensure_connection, который проверяет соединение раз за запрос.
+
+    Django вызывает его перед созданием курсора и при входе в atomic,
+    поэтому отвалившееся соединение заменяется до первого запроса к БД
+    и до начала транзакции.
+    """
+
+    def ensure():
+        if connection.health_check_pending:
+            connection.health_check_pending = False
+            if (
+                connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()
+            ):
+                close_broken(connection)
+        ensure_connection()
+
+    return ensure
+
+
+def check_persistent_connections(**kwargs):
+    """Проверяет постоянные соединения при первом обращении к БД в запросе.
+
+    Аналог CONN_HEALTH_CHECKS из Django 4.1: без проверки первый запрос
+    после перезапуска PostgreSQL или обрыва сети завершится ошибкой.
+    Проверка — один ``SELECT 1``, и только в запросах, которые обращаются
+    к БД: ответы из кэша, 304 и запросы с токеном без БД её не платят.
+    """
+    for connection in connections.all():
+        if not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if 'ensure_connection' not in vars(connection):
+            connection.ensure_connection = checked_ensure_connection(
+                connection, connection.ensure_connection
+            )
+        connection.health_check_pending = True
@@ -0,0 +1,54 @@
+"""PostgreSQL с пулом соединений внутри процесса.
+
+Подключается как ENGINE ``api_yamdb.pooled_postgresql``; размер пула и
+время ожидания задаются ключом ``POOL`` настроек БД. Закрытие соединения
+Django возвращает его в пул, поэтому CONN_MAX_AGE должен быть 0: потоки
+отдают соединение в конце каждого запроса.
+"""
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from ..pool import get_pool
+
+
+def ping(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        check = ping if self.settings_dict.get('CONN_HEALTH_CHECKS') else None
+        return get_pool(self.alias, self.settings_dict, check)
+
+    def get_new_connection(self, conn_params):
+        return self.pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            )
+        )
+
+    def _close(self):
+        if self.connection is None:
+            return
+        connection = self.connection
+        with self.wrap_database_errors:
+            try:
+                # В пул соединение возвращается без открытой транзакции.
+                status = connection.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    connection.close()
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except base.Database.Error:
+                connection.close()
+                raise
+            finally:
+                # Закрытое соединение пул отбрасывает.
+                self.pool.release(connection)
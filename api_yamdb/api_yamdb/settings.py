@@ -39,15 +39,25 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'api.replica.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Профилирование запросов (заголовок Server-Timing)
+# Доля профилируемых запросов, от 0 до 1
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', default=0))
+# Профилировать запросы с заголовком X-Profile
+PROFILING_ALLOW_HEADER = os.getenv('PROFILING_ALLOW_HEADER') == 'True'
+# Порог записи в лог api.profiling, мс; None — не записывать
+PROFILING_SLOW_REQUEST_MS = 500
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -69,6 +79,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Потоки ASGI-режима (api_yamdb.asgi): общий пул и пул горячих GET-запросов
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', default=8))
+ASGI_HOT_READ_THREADS = int(os.getenv('ASGI_HOT_READ_THREADS', default=8))
+
 
 # Database
 
@@ -80,10 +94,96 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='xxxyyyzzz'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Постоянные соединения, секунды; 0 — закрывать после запроса
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # Проверять постоянное соединение при первом обращении к БД в
+        # запросе (api_yamdb.pool)
+        'CONN_HEALTH_CHECKS': os.getenv(
+            'DB_CONN_HEALTH_CHECKS', default='True') == 'True',
     }
 }
 
+# Пул соединений внутри процесса для потоковых воркеров; 0 — без пула
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', default=0))
+if DB_POOL_SIZE:
+    DATABASES['default'].update(
+        ENGINE='api_yamdb.pooled_postgresql',
+        CONN_MAX_AGE=0,
+        POOL={
+            'SIZE': DB_POOL_SIZE,
+            # Сколько секунд ждать свободного соединения
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+        },
+    )
+
+# Реплика только для чтения; включается переменными REPLICA_DB_*
+if os.getenv('REPLICA_DB_HOST') or os.getenv('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv(
+            'REPLICA_DB_NAME', default=DATABASES['default']['NAME']),
+        'HOST': os.getenv(
+            'REPLICA_DB_HOST', default=DATABASES['default']['HOST']),
+        'PORT': os.getenv(
+            'REPLICA_DB_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api.replica.PrimaryReplicaRouter']
+# Сколько секунд после записи читать данные пользователя с основной БД
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=5))
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    },
+    # Ограничение частоты запросов; кэш должен быть общим для воркеров.
+    # Для DatabaseCache таблица создаётся командой createcachetable.
+    'throttle': {
+        'BACKEND': os.getenv(
+            'THROTTLE_CACHE_BACKEND',
+            default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv(
+            'THROTTLE_CACHE_LOCATION', default='throttle_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+# Кэши в памяти процесса: у каждого воркера свои версии моделей, и запись,
+# обработанная одним воркером, не сбрасывает ответы, закэшированные другими
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# Кэшировать ответы каталога; по умолчанию — только с общим для воркеров
+# CACHE_BACKEND (memcached, FileBasedCache в общем каталоге, DatabaseCache)
+CATALOG_CACHE_ENABLED = os.getenv(
+    'CATALOG_CACHE_ENABLED',
+    default=str(CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES),
+) == 'True'
+# Время жизни закэшированных ответов каталога, секунды
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', default=300))
+
+# Наибольшее число объектов в одном запросе пакетной записи
+BULK_WRITE_MAX_ITEMS = 500
+# Наибольшее число id в выборке ?ids= и в /reviews/latest/
+MULTI_GET_MAX_IDS = 100
+# Строк в одной порции потоковой выгрузки /export/
+EXPORT_CHUNK_SIZE = 2000
+# Мест в каждом рейтинге /titles/top/ и наименьшее число обзоров
+# у произведения в рейтинге (manage.py refresh_leaderboards)
+LEADERBOARD_SIZE = 100
+LEADERBOARD_MIN_REVIEWS = int(
+    os.getenv('LEADERBOARD_MIN_REVIEWS', default=10)
+)
+
 
 # Password validation
 
@@ -132,13 +232,24 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Частоты для регистрации и получения токена: с одного адреса
+    # и для одного имени пользователя (см. api.v1.throttling).
+    'DEFAULT_THROTTLE_RATES': {
+        'signup-ip': '30/hour',
+        'signup-username': '5/hour',
+        'token-ip': '60/hour',
+        'token-username': '10/hour',
+    },
+    # Число обратных прокси перед приложением: адрес клиента берётся
+    # из X-Forwarded-For, который добавляет nginx.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
 }
 
 
@@ -147,7 +258,21 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Кэш пользователей для JWT-аутентификации в памяти процесса
+AUTH_USER_CACHE_TIMEOUT = 30
+AUTH_USER_CACHE_SIZE = 10000
+# Брать роль и права пользователя из токена, не обращаясь к БД.
+# Смена роли и блокировка (is_active = False) тогда не действуют на уже
+# выданные токены до истечения ACCESS_TOKEN_LIFETIME, то есть до 10 дней;
+# отозвать такой токен можно только сменой SECRET_KEY.
+AUTH_STATELESS_TOKENS = os.getenv('AUTH_STATELESS_TOKENS') == 'True'
+
 DOMAIN_NAME = 'yamdb.ru'
 DEFAULT_SENDER_EMAIL = f'yamdb@{DOMAIN_NAME}'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Очередь исходящих писем (manage.py send_outbox)
+OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повтором, секунды; удваивается с каждой попыткой
+OUTBOX_RETRY_DELAY = 60
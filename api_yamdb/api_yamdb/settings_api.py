@@ -0,0 +1,34 @@
+"""Профиль настроек для воркеров, которые обслуживают только API.
+
+Админка, сессии, сообщения, статика и шаблоны Django здесь не нужны:
+без них воркер быстрее загружается и занимает меньше памяти. Миграции,
+collectstatic и админка работают с полными настройками api_yamdb.settings.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+UNUSED_APPS = {
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+}
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+
+# Пользователя определяет аутентификация DRF, а её представления
+# не проверяют CSRF, поэтому сессии и промежуточные слои вокруг них лишние.
+UNUSED_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+}
+MIDDLEWARE = [item for item in MIDDLEWARE if item not in UNUSED_MIDDLEWARE]
+
+ROOT_URLCONF = 'api_yamdb.urls_api'
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+}
@@ -0,0 +1,52 @@
+"""Прогрев приложения перед обслуживанием запросов.
+
+Django и DRF откладывают часть работы до первого запроса: компиляцию
+регулярных выражений URL, импорт классов из настроек REST_FRAMEWORK,
+обход связей моделей при построении полей сериализаторов. С
+``preload_app`` в gunicorn.conf.py прогрев выполняется один раз в
+мастер-процессе, и воркеры после fork получают готовые кэши.
+"""
+from django.db import connections
+from django.urls import get_resolver
+from rest_framework.serializers import ModelSerializer, Serializer
+from rest_framework.settings import api_settings
+
+DRF_CLASS_SETTINGS = (
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_THROTTLE_CLASSES',
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_FILTER_BACKENDS',
+    'DEFAULT_PAGINATION_CLASS',
+    'EXCEPTION_HANDLER',
+)
+
+
+def project_serializers(base=Serializer):
+    """Сериализаторы проекта, без классов самого DRF и общих баз
+    ModelSerializer без Meta."""
+    for serializer_class in base.__subclasses__():
+        abstract = (
+            issubclass(serializer_class, ModelSerializer)
+            and not hasattr(serializer_class, 'Meta')
+        )
+        if not (
+            serializer_class.__module__.startswith('rest_framework')
+            or abstract
+        ):
+            yield serializer_class
+        yield from project_serializers(serializer_class)
+
+
+def warm_up():
+    """Заполняет ленивые кэши URL, настроек DRF и сериализаторов."""
+    # Обращение к reverse_dict обходит все URL-шаблоны и компилирует их.
+    get_resolver().reverse_dict
+    for name in DRF_CLASS_SETTINGS:
+        getattr(api_settings, name)
+    for serializer_class in set(project_serializers()):
+        serializer_class().fields
+    # Соединения, открытые до fork, нельзя делить между воркерами.
+    connections.close_all()
@@ -0,0 +1,8 @@
+# Настройки gunicorn; файл читается из рабочего каталога при запуске.
+import os
+
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', default=2))
+# Приложение загружается и прогревается (api_yamdb.warmup) в мастере
+# до fork: воркеры стартуют сразу готовыми к запросам.
+preload_app = os.getenv('GUNICORN_PRELOAD', default='True') == 'True'
@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Произведения, которые удаляются сейчас: их строки исчезнут в том же
+# удалении, и сдвигать им дату и рейтинг по каждой связанной строке
+# незачем. None — удаление идёт без cascade_delete, отметки не ставятся.
+deleting_titles = ContextVar('deleting_titles', default=None)
+# Авторы, которые удаляются сейчас, и сдвиги рейтинга их обзоров: они
+# применяются одним UPDATE после удаления всех обзоров автора.
+deleting_authors = ContextVar('deleting_authors', default=None)
+
+
+@contextmanager
+def cascade_delete():
+    """Разрешает сигналам удаления отмечать произведения и авторов.
+
+    Отметки снимаются при выходе, в том числе если удаление прервалось
+    ошибкой: иначе они остались бы в контексте потока, и последующие
+    удаления обзоров не сдвигали бы рейтинг.
+    """
+    titles = deleting_titles.set(deleting_titles.get() or frozenset())
+    authors = deleting_authors.set(dict(deleting_authors.get() or {}))
+    try:
+        yield
+    finally:
+        deleting_authors.reset(authors)
+        deleting_titles.reset(titles)
+
+
+class CascadeDeleteMixin:
+    """Удаление объекта с каскадом обзоров без UPDATE на каждый обзор.
+
+    Удаление через QuerySet.delete() идёт без отметок: рейтинг сдвигается
+    по каждому обзору, медленнее, но так же верно.
+    """
+
+    def delete(self, *args, **kwargs):
+        with cascade_delete():
+            return super().delete(*args, **kwargs)
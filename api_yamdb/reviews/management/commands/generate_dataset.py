@@ -0,0 +1,244 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from progress.counter import Counter
+from reviews.models import (SCORES, Category, Comment, Genre, GenreTitle,
+                            Review, Title, User)
+
+from .load_csv import CsvModelLoader, reset_sequences
+
+WORDS = (
+    'тень ветер город море время огонь дорога сад дом река ночь зима '
+    'свет песня король звезда лес мост камень птица остров путь'
+).split()
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def zipf_counts(total, items, skew, cap):
+    """Делит ``total`` между ``items`` по закону Ципфа.
+
+    Первое место получает больше всех; ни одно не получает больше ``cap``.
+    """
+    weights = [1 / (rank ** skew) for rank in range(1, items + 1)]
+    scale = total / sum(weights)
+    return [min(int(weight * scale), cap) for weight in weights]
+
+
+class Writer:
+    """Пакетная запись строк одной модели через CsvModelLoader.write."""
+
+    def __init__(self, model, columns, batch_size, use_copy, before=()):
+        self.loader = CsvModelLoader(
+            model, ('id', *columns), batch_size, use_copy, None
+        )
+        self.model = model
+        self.batch_size = batch_size
+        self.before = before
+        self.rows = []
+        self.progress = Counter(f'{model._meta.verbose_name_plural} ')
+
+    def add(self, **values):
+        self.rows.append(values)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Строки, на которые ссылается пакет, записываются раньше него.
+        for writer in self.before:
+            writer.flush()
+        if self.rows:
+            self.loader.write(self.rows)
+            self.progress.next(len(self.rows))
+            self.rows = []
+
+    def finish(self):
+        self.flush()
+        self.progress.finish()
+        reset_sequences(self.model)
+        return self.loader.loaded
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерация синтетического каталога для нагрузочных тестов: '
+        'пользователи, произведения, обзоры и комментарии. Обзоры '
+        'распределены по закону Ципфа: немногие произведения собирают '
+        'большую часть обзоров, а их обзоры — большую часть комментариев.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--titles', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=200000)
+        parser.add_argument('--comments', type=int, default=500000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='Показатель закона Ципфа для числа обзоров на произведение',
+        )
+        parser.add_argument('--days', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--no-copy', action='store_true',
+            help='Не использовать COPY даже на PostgreSQL',
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['titles'] < 1:
+            raise CommandError(
+                'Нужны хотя бы один пользователь и одно произведение'
+            )
+        self.rnd = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.options = options
+        self.use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy']
+        )
+        with transaction.atomic():
+            users = self.create_users()
+            categories, genres = self.create_categories_and_genres()
+            reviews = self.create_titles_and_reviews(
+                users, categories, genres
+            )
+            self.create_comments(users, reviews)
+
+    def writer(self, model, columns, before=()):
+        return Writer(
+            model, columns, self.options['batch_size'], self.use_copy, before
+        )
+
+    def finish(self, *writers):
+        for writer in writers:
+            created = writer.finish()
+            self.stdout.write(
+                f'{writer.model._meta.verbose_name_plural}: '
+                f'создано строк {created}'
+            )
+
+    def past_date(self):
+        return self.now - timedelta(
+            seconds=self.rnd.randrange(self.options['days'] * 86400)
+        )
+
+    def text(self, words):
+        return ' '.join(self.rnd.choices(WORDS, k=words)).capitalize()
+
+    def create_users(self):
+        first = next_pk(User)
+        password = make_password(None)
+        writer = self.writer(User, (
+            'username', 'email', 'password', 'role', 'date_joined',
+        ))
+        for pk in range(first, first + self.options['users']):
+            writer.add(
+                id=pk, username=f'load{pk}', email=f'load{pk}@yamdb.fake',
+                password=password, role=User.USER,
+                date_joined=self.past_date(),
+            )
+        self.finish(writer)
+        return range(first, first + self.options['users'])
+
+    def create_categories_and_genres(self):
+        created = []
+        for model, count in ((Category, self.options['categories']),
+                             (Genre, self.options['genres'])):
+            first = next_pk(model)
+            writer = self.writer(model, ('name', 'slug'))
+            for pk in range(first, first + count):
+                writer.add(
+                    id=pk, name=self.text(2),
+                    slug=f'load-{model._meta.model_name}-{pk}',
+                )
+            self.finish(writer)
+            created.append(range(first, first + count))
+        return created
+
+    def create_titles_and_reviews(self, users, categories, genres):
+        """Произведения со связями и обзорами; возвращает диапазон id обзоров.
+
+        Обзоры пишутся вместе со своим произведением, поэтому счётчики
+        рейтинга заполняются сразу, без пересчёта по таблице обзоров.
+        Популярные произведения идут первыми, и их обзоры получают
+        меньшие id.
+        """
+        titles = self.writer(Title, (
+            'name', 'year', 'description', 'category_id',
+            'score_sum', 'review_count',
+            *map(Title.score_count_field, SCORES),
+        ))
+        genre_titles = self.writer(
+            GenreTitle, ('title_id', 'genre_id'), (titles,)
+        )
+        reviews = self.writer(
+            Review, ('title_id', 'author_id', 'text', 'score', 'pub_date'),
+            (titles,),
+        )
+        first_title = next_pk(Title)
+        genre_title_pk = next_pk(GenreTitle)
+        first_review = review_pk = next_pk(Review)
+        counts = zipf_counts(
+            self.options['reviews'], self.options['titles'],
+            self.options['skew'], len(users),
+        )
+        for title_pk, count in enumerate(counts, first_title):
+            quality = self.rnd.gauss(6.5, 1.5)
+            scores = [
+                min(max(round(self.rnd.gauss(quality, 2)), 1), 10)
+                for _ in range(count)
+            ]
+            titles.add(
+                id=title_pk, name=self.text(self.rnd.randint(1, 4)),
+                year=self.rnd.randint(1900, self.now.year),
+                description=self.text(20) if self.rnd.random() < 0.8
+                else None,
+                category_id=self.rnd.choice(categories),
+                score_sum=sum(scores), review_count=count,
+                **{
+                    Title.score_count_field(score): scores.count(score)
+                    for score in SCORES
+                },
+            )
+            for genre in self.rnd.sample(genres, min(
+                self.rnd.randint(1, 3), len(genres)
+            )):
+                genre_titles.add(
+                    id=genre_title_pk, title_id=title_pk, genre_id=genre
+                )
+                genre_title_pk += 1
+            for author, score in zip(self.rnd.sample(users, count), scores):
+                reviews.add(
+                    id=review_pk, title_id=title_pk, author_id=author,
+                    text=self.text(self.rnd.randint(5, 60)), score=score,
+                    pub_date=self.past_date(),
+                )
+                review_pk += 1
+        self.finish(titles, genre_titles, reviews)
+        return range(first_review, review_pk)
+
+    def create_comments(self, users, reviews):
+        if not reviews:
+            return
+        comments = self.writer(
+            Comment, ('review_id', 'author_id', 'text', 'pub_date')
+        )
+        first = next_pk(Comment)
+        for pk in range(first, first + self.options['comments']):
+            # Куб равномерной величины смещает выбор к первым, то есть
+            # самым популярным, обзорам.
+            review = reviews[int(len(reviews) * self.rnd.random() ** 3)]
+            comments.add(
+                id=pk, review_id=review, author_id=self.rnd.choice(users),
+                text=self.text(self.rnd.randint(3, 30)),
+                pub_date=self.past_date(),
+            )
+        self.finish(comments)
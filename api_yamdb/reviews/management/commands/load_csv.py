@@ -0,0 +1,332 @@
+import csv
+import io
+import os
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.utils import timezone
+from progress.counter import Counter
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+FILE_MODEL_MAPPING = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', GenreTitle),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+COPY_NULL = r'\N'
+
+
+class RejectedRowError(Exception):
+    pass
+
+
+def reset_sequences(model):
+    """Сдвигает последовательность ключей после вставки с явными id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+@contextmanager
+def keep_loaded_dates(fields):
+    """Не даёт auto_now_add перезаписать даты, пришедшие из файла."""
+    patched = [
+        field for field in fields if getattr(field, 'auto_now_add', False)
+    ]
+    for field in patched:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in patched:
+            field.auto_now_add = True
+
+
+def unique_keys(model):
+    """Поля и наборы полей модели, значения которых должны быть уникальны."""
+    keys = [
+        (field.attname,) for field in model._meta.concrete_fields
+        if field.unique
+    ]
+    keys.extend(
+        tuple(model._meta.get_field(name).attname
+              for name in constraint.fields)
+        for constraint in model._meta.constraints
+        if isinstance(constraint, models.UniqueConstraint)
+    )
+    return keys
+
+
+class CsvModelLoader:
+    """Потоковая пакетная загрузка одного CSV-файла в модель.
+
+    Строки читаются пакетами по ``batch_size``. Внешние ключи и
+    уникальность проверяются одним запросом на пакет, отклонённые строки
+    передаются в ``reject`` вместе с причиной.
+    """
+
+    def __init__(self, model, header, batch_size, use_copy, reject):
+        self.model = model
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.reject = reject
+        self.fields = [self.get_field(column) for column in header]
+        self.unique_keys = [
+            key for key in unique_keys(model)
+            if set(key) <= {field.attname for field in self.fields}
+        ]
+        self.loaded = 0
+
+    def get_field(self, column):
+        for field in self.model._meta.concrete_fields:
+            if column in (field.name, field.attname):
+                return field
+        raise CommandError(
+            f'{self.model.__name__}: неизвестная колонка `{column}`'
+        )
+
+    def convert(self, row):
+        if len(row) != len(self.fields):
+            raise RejectedRowError('неверное число колонок')
+        values = {}
+        for field, raw in zip(self.fields, row):
+            if raw == '' and getattr(field, 'auto_now_add', False):
+                values[field.attname] = timezone.now()
+                continue
+            if raw == '' and field.has_default():
+                values[field.attname] = field.get_default()
+                continue
+            value = None if raw == '' and field.null else raw
+            try:
+                if field.is_relation:
+                    values[field.attname] = (
+                        None if value is None
+                        else field.target_field.to_python(value)
+                    )
+                else:
+                    values[field.attname] = field.clean(value, None)
+            except ValidationError as error:
+                raise RejectedRowError(f'{field.name}: {"; ".join(error)}')
+        return values
+
+    def check_relations(self, batch):
+        """Отклоняет строки со ссылками на несуществующие объекты."""
+        for field in self.fields:
+            if not field.is_relation:
+                continue
+            wanted = {
+                values[field.attname] for _, values in batch
+                if values[field.attname] is not None
+            }
+            existing = set(
+                field.related_model._base_manager.filter(
+                    pk__in=wanted
+                ).values_list('pk', flat=True)
+            )
+            for item in batch:
+                value = item[1][field.attname]
+                if value is not None and value not in existing:
+                    item[1] = RejectedRowError(
+                        f'{field.name}: объект {value} не найден'
+                    )
+            batch = [item for item in batch if isinstance(item[1], dict)]
+        return batch
+
+    def existing_keys(self, key, values):
+        """Значения ``values`` ключа ``key``, которые уже есть в таблице.
+
+        Составной ключ сравнивается парами через (a, b) IN (VALUES ...):
+        условия ``__in`` по каждому полю совпали бы со всеми сочетаниями
+        уже загруженных значений.
+        """
+        manager = self.model._base_manager
+        if len(key) == 1:
+            return set(manager.filter(**{
+                f'{key[0]}__in': [value for value, in values]
+            }).values_list(*key))
+        fields = [self.model._meta.get_field(name) for name in key]
+        columns = ', '.join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        row = f'({", ".join(["%s"] * len(key))})'
+        values = list(values)
+        size = connection.ops.bulk_batch_size(fields, values) or 1
+        existing = set()
+        with connection.cursor() as cursor:
+            for start in range(0, len(values), size):
+                chunk = values[start:start + size]
+                cursor.execute(
+                    f'SELECT {columns} FROM {table} WHERE ({columns}) '
+                    f'IN (VALUES {", ".join([row] * len(chunk))})',
+                    [part for value in chunk for part in value],
+                )
+                existing.update(map(tuple, cursor.fetchall()))
+        return existing
+
+    def check_unique(self, batch):
+        """Отклоняет дубликаты внутри пакета и уже загруженных строк.
+
+        Предыдущие пакеты записаны в той же транзакции, поэтому их строки
+        находит запрос к таблице, и помнить ключи всего файла не нужно.
+        """
+        for key in self.unique_keys:
+            existing = self.existing_keys(key, {
+                tuple(values[name] for name in key) for _, values in batch
+            })
+            seen = set()
+            for item in batch:
+                value = tuple(item[1][name] for name in key)
+                if value in existing or value in seen:
+                    item[1] = RejectedRowError(
+                        f'{", ".join(key)}: значение {value} уже существует'
+                    )
+                else:
+                    seen.add(value)
+            batch = [item for item in batch if isinstance(item[1], dict)]
+        return batch
+
+    def load(self, rows, progress):
+        """Загружает пары (номер строки файла, строка CSV)."""
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return
+            batch = []
+            for line, row in chunk:
+                try:
+                    batch.append([(line, row), self.convert(row)])
+                except RejectedRowError as error:
+                    self.reject(line, row, error)
+            checked = self.check_unique(self.check_relations(batch))
+            for (line, row), values in batch:
+                if isinstance(values, RejectedRowError):
+                    self.reject(line, row, values)
+            self.write([values for _, values in checked])
+            progress.next(len(chunk))
+
+    def write(self, rows):
+        if not rows:
+            return
+        objs = [self.model(**values) for values in rows]
+        with keep_loaded_dates(self.fields):
+            if self.use_copy:
+                self.copy(objs)
+            else:
+                self.model._base_manager.bulk_create(
+                    objs, batch_size=self.batch_size
+                )
+        self.loaded += len(objs)
+
+    def copy(self, objs):
+        """Вставка пакета через COPY ... FROM STDIN (только PostgreSQL)."""
+        pk = self.model._meta.pk
+        fields = [
+            field for field in self.model._meta.concrete_fields
+            if field is not pk or pk in self.fields
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow(
+                COPY_NULL if value is None else value
+                for value in (
+                    field.get_db_prep_save(
+                        field.pre_save(obj, True), connection
+                    )
+                    for field in fields
+                )
+            )
+        buffer.seek(0)
+        columns = ', '.join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f'COPY {table} ({columns}) '
+                f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer,
+            )
+
+
+class Command(BaseCommand):
+    help = 'Потоковая загрузка тестовых данных из каталога static/data/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=os.path.join(settings.BASE_DIR, 'static/data'),
+            help='Каталог с CSV-файлами',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Число строк в одном пакете вставки',
+        )
+        parser.add_argument(
+            '--rejects',
+            help='Файл для отклонённых строк '
+                 '(по умолчанию <data-dir>/rejected.csv)',
+        )
+        parser.add_argument(
+            '--no-copy', action='store_true',
+            help='Не использовать COPY даже на PostgreSQL',
+        )
+
+    def handle(self, *args, **options):
+        data_dir = options['data_dir']
+        rejects_path = options['rejects'] or os.path.join(
+            data_dir, 'rejected.csv'
+        )
+        use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+        with open(rejects_path, 'w', newline='') as rejects_file:
+            rejects = csv.writer(rejects_file)
+            rejects.writerow(('file', 'line', 'error', 'values...'))
+            for filename, model in FILE_MODEL_MAPPING:
+                path = os.path.join(data_dir, filename)
+                if not os.path.exists(path):
+                    self.stderr.write(f'{filename}: файл не найден, пропуск')
+                    continue
+
+                def reject(line, row, error, filename=filename):
+                    rejects.writerow((filename, line, error, *row))
+
+                loaded = self.load_file(
+                    path, model, options['batch_size'], use_copy, reject
+                )
+                self.stdout.write(
+                    f'{filename}: загружено строк {loaded}'
+                )
+        call_command('rebuild_title_ratings', stdout=self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(f'Отклонённые строки: {rejects_path}')
+        )
+
+    def load_file(self, path, model, batch_size, use_copy, reject):
+        with open(path, newline='', encoding='utf-8') as csv_file:
+            reader = csv.reader(csv_file)
+            loader = CsvModelLoader(
+                model, next(reader), batch_size, use_copy, reject
+            )
+            progress = Counter(
+                f'{os.path.basename(path)} --> {model._meta.verbose_name} '
+            )
+            with transaction.atomic():
+                loader.load(
+                    ((reader.line_num, row) for row in reader), progress
+                )
+                reset_sequences(model)
+            progress.finish()
+        return loader.loaded
@@ -0,0 +1,57 @@
+from functools import reduce
+from operator import or_
+
+from api.v1.cache import bump_model_version
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Now
+from reviews.models import SCORES, Review, Title
+
+
+def actual_rating_expressions():
+    """Выражения счётчиков рейтинга, посчитанные по Review."""
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by().values(
+        'title'
+    )
+
+    def total(queryset, aggregate):
+        return Coalesce(
+            Subquery(queryset.annotate(total=aggregate).values('total'),
+                     output_field=IntegerField()),
+            0,
+        )
+
+    expressions = {
+        'score_sum': total(reviews, Sum('score')),
+        'review_count': total(reviews, Count('pk')),
+    }
+    for score in SCORES:
+        expressions[Title.score_count_field(score)] = total(
+            reviews.filter(score=score), Count('pk')
+        )
+    return expressions
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рейтингов произведений по таблице обзоров'
+
+    def handle(self, *args, **options):
+        expressions = actual_rating_expressions()
+        drifted = Title.objects.annotate(**{
+            f'actual_{name}': expression
+            for name, expression in expressions.items()
+        }).filter(reduce(or_, (
+            ~Q(**{name: F(f'actual_{name}')}) for name in expressions
+        )))
+        with transaction.atomic():
+            # Дата изменения сдвигается только у исправленных строк: по ней
+            # и по версии модели в кэше клиенты узнают о новом рейтинге.
+            fixed = Title.objects.filter(
+                pk__in=drifted.values('pk')
+            ).update(**expressions, updated=Now())
+            if fixed:
+                bump_model_version(Title)
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено произведений: {fixed}')
+        )
@@ -0,0 +1,119 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, FloatField, Max, Window
+from django.db.models.functions import Cast, RowNumber
+from reviews.models import LeaderboardEntry, Title
+
+# Рейтинг по категории или жанру: путь к ссылке от произведения.
+PARTITIONS = {
+    LeaderboardEntry.CATEGORY: 'category__slug',
+    LeaderboardEntry.GENRE: 'genre__slug',
+}
+
+
+def ranked_titles():
+    """Произведения с достаточным числом обзоров и средней оценкой."""
+    return Title.objects.filter(
+        review_count__gte=settings.LEADERBOARD_MIN_REVIEWS
+    ).annotate(
+        average=Cast('score_sum', FloatField()) / F('review_count')
+    ).order_by()
+
+
+# При равной оценке выше произведение с большим числом обзоров.
+RANK_ORDER = (F('average').desc(), F('review_count').desc(), F('id').asc())
+
+
+def top_overall(size):
+    title_ids = ranked_titles().order_by(*RANK_ORDER).values_list(
+        'pk', flat=True
+    )[:size]
+    return [
+        LeaderboardEntry(
+            board=LeaderboardEntry.ALL, position=position, title_id=title_id
+        )
+        for position, title_id in enumerate(title_ids, 1)
+    ]
+
+
+def top_by(board, size):
+    """Первые ``size`` мест в каждой категории или жанре одним запросом.
+
+    Места считает ROW_NUMBER() по разделам, а отсечение по месту
+    выполняется во внешнем запросе, как в LatestReviewsView.
+    """
+    ranked = ranked_titles().filter(**{
+        f'{PARTITIONS[board]}__isnull': False
+    }).annotate(
+        board_slug=F(PARTITIONS[board]),
+        position=Window(
+            RowNumber(),
+            partition_by=[F(PARTITIONS[board])],
+            order_by=list(RANK_ORDER),
+        ),
+    ).values('pk', 'board_slug', 'position')
+    sql, params = ranked.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT ranked.id, ranked.board_slug, ranked.position '
+            f'FROM ({sql}) ranked WHERE ranked.position <= %s',
+            (*params, size),
+        )
+        return [
+            LeaderboardEntry(
+                board=board, slug=slug, position=position, title_id=title_id
+            )
+            for title_id, slug, position in cursor.fetchall()
+        ]
+
+
+def refresh_leaderboards():
+    """Пересчитывает все рейтинги и возвращает число записанных мест.
+
+    Старые места заменяются в одной транзакции, поэтому читатели видят
+    либо прежние рейтинги, либо новые целиком.
+    """
+    size = settings.LEADERBOARD_SIZE
+    entries = top_overall(size)
+    for board in PARTITIONS:
+        entries.extend(top_by(board, size))
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчёт рейтингов лучших произведений: общего, по категориям '
+        'и по жанрам'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Пауза между проверками изменений каталога, секунды',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Пересчитать рейтинги один раз и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        state = None
+        while True:
+            # Оценки, жанры и категории сдвигают дату изменения
+            # произведения, а удаление уменьшает их число.
+            current = Title.objects.aggregate(
+                last=Max('updated'), count=Count('pk')
+            )
+            if current != state:
+                written = refresh_leaderboards()
+                state = current
+                self.stdout.write(f'Рейтинги пересчитаны, мест: {written}')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-17 04:05
+
+import django.core.validators
+from django.db import migrations, models
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_auto_20220830_0659'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='Genre_Title',
+            new_name='GenreTitle',
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, 'Оценка не может быть менее 1'), django.core.validators.MaxValueValidator(10, 'Оценка не может быть более 10')], verbose_name='оценка'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.IntegerField(db_index=True, validators=[reviews.validators.notlaterthisyearvalidatetor], verbose_name='Год выхода'),
+        ),
+    ]
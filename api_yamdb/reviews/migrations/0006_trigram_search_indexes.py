@@ -0,0 +1,51 @@
+# Generated by Django 2.2.28 on 2026-10-17 04:15
+
+import warnings
+
+from django.db import DatabaseError, migrations, transaction
+
+# Поиск по подстроке (icontains) на PostgreSQL компилируется в
+# UPPER("name"::text) LIKE UPPER('%...%'), поэтому индексы строятся
+# по тому же выражению.
+TRIGRAM_INDEXES = (
+    ('title_name_trgm_idx', 'reviews_title'),
+    ('category_name_trgm_idx', 'reviews_category'),
+    ('genre_name_trgm_idx', 'reviews_genre'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError as error:
+        warnings.warn(
+            f'pg_trgm недоступен, поиск по названию будет без индекса: '
+            f'{error}'
+        )
+        return
+    for name, table in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin (UPPER(name) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_score_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by().values(
+        'title'
+    )
+    Title.objects.update(**{
+        f'score_count_{score}': Coalesce(
+            Subquery(
+                reviews.filter(score=score).annotate(
+                    total=Count('pk')
+                ).values('total'),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+        for score in range(1, 11)
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_updated_watermarks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_count_1',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 1'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_2',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 2'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_3',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 3'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_4',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 4'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_5',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 5'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_6',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 6'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_7',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 7'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_8',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 8'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_9',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 9'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count_10',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Обзоров с оценкой 10'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.28 on 2026-10-17 05:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('all', 'Общий'), ('category', 'Категория'), ('genre', 'Жанр')], max_length=10, verbose_name='Рейтинг')),
+                ('slug', models.SlugField(blank=True, db_index=False, verbose_name='Ссылка категории или жанра')),
+                ('position', models.PositiveIntegerField(verbose_name='Место')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтингах',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['board', 'slug', 'position'], name='leaderboard_position_idx'),
+        ),
+    ]
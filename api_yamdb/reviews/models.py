@@ -1,11 +1,15 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
+from .deletion import CascadeDeleteMixin
 from .validators import notlaterthisyearvalidatetor
 
 User = get_user_model()
 
+SCORES = range(1, 11)
+
 
 class Category(models.Model):
     """Модель таблицы Category."""
@@ -37,7 +41,7 @@ class Genre(models.Model):
         return self.name
 
 
-class Title(models.Model):
+class Title(CascadeDeleteMixin, models.Model):
     """Модель таблицы Title."""
 
     name = models.CharField(max_length=256, verbose_name='Наименование')
@@ -59,15 +63,77 @@ class Title(models.Model):
     genre = models.ManyToManyField(
         Genre, through='GenreTitle', verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество обзоров'
+    )
+    # Распределение оценок; сдвигается вместе с score_sum и review_count.
+    score_count_1 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 1'
+    )
+    score_count_2 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 2'
+    )
+    score_count_3 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 3'
+    )
+    score_count_4 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 4'
+    )
+    score_count_5 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 5'
+    )
+    score_count_6 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 6'
+    )
+    score_count_7 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 7'
+    )
+    score_count_8 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 8'
+    )
+    score_count_9 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 9'
+    )
+    score_count_10 = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Обзоров с оценкой 10'
+    )
+    updated = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка по обзорам или None, если обзоров нет."""
+        if not self.review_count:
+            return None
+        return self.score_sum / self.review_count
+
+    @staticmethod
+    def score_count_field(score):
+        """Имя поля с числом обзоров, поставивших оценку ``score``."""
+        return f'score_count_{score}'
+
+    def score_distribution(self):
+        """Число обзоров по каждой оценке от 1 до 10."""
+        return {
+            score: getattr(self, self.score_count_field(score))
+            for score in SCORES
+        }
+
 
 class GenreTitle(models.Model):
     """Модель таблицы GenreTitle."""
@@ -79,6 +145,13 @@ class GenreTitle(models.Model):
         Genre, on_delete=models.CASCADE, verbose_name='Жанр'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='genretitle_genre_title_idx'
+            ),
+        ]
+
 
 class Review(models.Model):
     """Модель таблицы Review."""
@@ -106,11 +179,17 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name='Дата публикации обзора'
     )
+    updated = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Обзор'
         verbose_name_plural = 'Обзоры'
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['title', 'id'], name='review_title_id_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'], name='unique_title_author'
@@ -124,6 +203,22 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:40]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_score()
+        return instance
+
+    def remember_score(self):
+        """Запоминает сохранённые в БД произведение и оценку обзора."""
+        self._saved_score = (self.__dict__.get('title_id'),
+                             self.__dict__.get('score'))
+
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save в той же транзакции.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель таблицы Comment."""
@@ -144,11 +239,73 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name='Дата публикации комментария'
     )
+    updated = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['review']
+        indexes = [
+            models.Index(
+                fields=['review', 'id'], name='comment_review_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:40]
+
+    def delete(self, *args, **kwargs):
+        # Удаление не оставляет строки с новой датой: её сдвигает обзор.
+        # Здесь, а не в сигнале: обработчик post_delete у Comment заставил
+        # бы каскадное удаление обзоров выбирать и удалять комментарии
+        # по одному. Каскад от автора сдвигает даты в reviews.signals.
+        with transaction.atomic(using=kwargs.get('using')):
+            Review.objects.filter(pk=self.review_id).update(
+                updated=timezone.now()
+            )
+            return super().delete(*args, **kwargs)
+
+
+class LeaderboardEntry(models.Model):
+    """Место произведения в рейтинге лучших.
+
+    Рейтинги пересчитываются командой refresh_leaderboards: общий и по
+    каждой категории и жанру, не длиннее LEADERBOARD_SIZE. Чтение первых
+    N мест идёт по индексу и не зависит от размера каталога.
+    """
+
+    ALL = 'all'
+    CATEGORY = 'category'
+    GENRE = 'genre'
+    BOARDS = (
+        (ALL, 'Общий'),
+        (CATEGORY, 'Категория'),
+        (GENRE, 'Жанр'),
+    )
+
+    board = models.CharField(
+        max_length=10, choices=BOARDS, verbose_name='Рейтинг'
+    )
+    slug = models.SlugField(
+        max_length=50, blank=True, db_index=False,
+        verbose_name='Ссылка категории или жанра',
+    )
+    position = models.PositiveIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
+        Title,
+        related_name='leaderboard_entries',
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+    )
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтингах'
+        indexes = [
+            models.Index(
+                fields=['board', 'slug', 'position'],
+                name='leaderboard_position_idx',
+            ),
+        ]
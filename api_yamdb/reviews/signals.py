@@ -0,0 +1,173 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .deletion import deleting_authors, deleting_titles
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+
+def touch_titles(**lookup):
+    """Сдвигает дату изменения произведений, не меняя остальных полей."""
+    Title.objects.filter(**lookup).update(updated=timezone.now())
+
+
+def touch_author_content(author):
+    """Сдвигает даты изменения обзоров и комментариев автора: их ответы
+    содержат имя автора."""
+    now = timezone.now()
+    Review.objects.filter(author=author).update(updated=now)
+    Comment.objects.filter(author=author).update(updated=now)
+
+
+def rating_deltas(scores):
+    """Изменения счётчиков рейтинга по словарю {оценка: ±число обзоров}."""
+    deltas = {
+        'score_sum': sum(score * delta for score, delta in scores.items()),
+        'review_count': sum(scores.values()),
+    }
+    for score, delta in scores.items():
+        deltas[Title.score_count_field(score)] = delta
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def shift_title_ratings(changes):
+    """Сдвигает счётчики рейтинга произведений одним UPDATE.
+
+    ``changes`` — словарь {id произведения: {оценка: ±число обзоров}}.
+    Сумма, число обзоров и распределение оценок меняются одной командой,
+    поэтому всегда согласованы. Вызывается из сигналов Review и там, где
+    обзоры пишутся без сигналов, например через bulk_create. Возвращает
+    число обновлённых произведений.
+    """
+    deltas = {
+        title_id: rating_deltas(scores)
+        for title_id, scores in changes.items()
+    }
+    deltas = {title_id: delta for title_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    if len(deltas) == 1:
+        updates = {
+            name: F(name) + delta
+            for name, delta in next(iter(deltas.values())).items()
+        }
+    else:
+        updates = {
+            name: F(name) + Case(
+                *(When(pk=title_id, then=Value(delta[name]))
+                  for title_id, delta in deltas.items() if name in delta),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            for name in set().union(*deltas.values())
+        }
+    return Title.objects.filter(pk__in=deltas).update(
+        **updates, updated=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    changes = defaultdict(Counter)
+    if not created:
+        old_title_id, old_score = getattr(
+            instance, '_saved_score', (None, None)
+        )
+        if old_title_id is None or old_score is None:
+            old_title_id, old_score = instance.title_id, instance.score
+        changes[old_title_id][old_score] -= 1
+    changes[instance.title_id][instance.score] += 1
+    if not shift_title_ratings(changes) and created:
+        # Внешний ключ отложенный и проверяется только при фиксации
+        # транзакции, а счётчики нового обзора есть у любого произведения:
+        # ни одной обновлённой строки — значит, произведения нет. Исключение
+        # откатывает вставку в транзакции Review.save.
+        raise Title.DoesNotExist(
+            f'Произведение {instance.title_id} не найдено'
+        )
+    instance.remember_score()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if instance.title_id in (deleting_titles.get() or ()):
+        return
+    changes = (deleting_authors.get() or {}).get(instance.author_id)
+    if changes is None:
+        shift_title_ratings({instance.title_id: {instance.score: -1}})
+    else:
+        changes[instance.title_id][instance.score] -= 1
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def author_saved(sender, instance, created, **kwargs):
+    saved_username = getattr(instance, '_saved_username', None)
+    if not created and saved_username not in (None, instance.username):
+        touch_author_content(instance)
+    instance.remember_username()
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def author_deleting(sender, instance, **kwargs):
+    # Комментарии автора удаляются каскадом без Comment.delete.
+    Review.objects.filter(comments__author=instance).update(
+        updated=timezone.now()
+    )
+    pending = deleting_authors.get()
+    if pending is not None:
+        pending[instance.pk] = defaultdict(Counter)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def author_deleted(sender, instance, **kwargs):
+    changes = (deleting_authors.get() or {}).pop(instance.pk, None)
+    if changes:
+        shift_title_ratings(changes)
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance, **kwargs):
+    # Сигналы pre_delete каскада приходят до удаления строк, post_delete —
+    # после. Отметку снимает cascade_delete.
+    marks = deleting_titles.get()
+    if marks is not None:
+        deleting_titles.set(marks | {instance.pk})
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    if instance.title_id not in (deleting_titles.get() or ()):
+        touch_titles(pk=instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_titles(pk=instance.pk)
+    elif pk_set is None:
+        touch_titles(genre=instance)
+    else:
+        touch_titles(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        touch_titles(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        touch_titles(genre=instance)
@@ -0,0 +1,91 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from users.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди исходящих'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Число писем, забираемых за одну транзакцию',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди, секунды',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь один раз и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                sent = self.process_batch(connection, options['batch_size'])
+                if sent:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+
+    def process_batch(self, connection, batch_size):
+        """Отправляет пачку писем, заблокированных этим обработчиком.
+
+        SKIP LOCKED позволяет нескольким обработчикам разбирать очередь
+        параллельно, не дожидаясь друг друга и не отправляя письма дважды.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=OutboxEmail.PENDING,
+                    next_attempt_at__lte=timezone.now(),
+                )
+                .order_by('next_attempt_at')[:batch_size]
+            )
+            for email in emails:
+                self.send(connection, email)
+                email.save(update_fields=(
+                    'status', 'attempts', 'next_attempt_at', 'last_error',
+                    'sent_at',
+                ))
+        return len(emails)
+
+    def send(self, connection, email):
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.message,
+            from_email=email.from_email,
+            to=[email.recipient],
+            connection=connection,
+        )
+        email.attempts += 1
+        try:
+            # Открытое соединение переиспользуется для следующих писем.
+            connection.open()
+            message.send()
+        except Exception as error:
+            email.last_error = repr(error)
+            if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.FAILED
+            else:
+                email.next_attempt_at = timezone.now() + timedelta(
+                    seconds=settings.OUTBOX_RETRY_DELAY
+                    * 2 ** (email.attempts - 1)
+                )
+            # Соединение могло оборваться: следующее письмо откроет новое.
+            connection.close()
+            return
+        email.status = OutboxEmail.SENT
+        email.sent_at = timezone.now()
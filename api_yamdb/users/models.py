@@ -1,8 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+from reviews.deletion import CascadeDeleteMixin
 
 
-class User(AbstractUser):
+class User(CascadeDeleteMixin, AbstractUser):
     USER = 'user'
     MODERATOR = 'moderator'
     ADMIN = 'admin'
@@ -23,6 +25,16 @@ class User(AbstractUser):
         blank=True,
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_username()
+        return instance
+
+    def remember_username(self):
+        """Запоминает сохранённое в БД имя пользователя."""
+        self._saved_username = self.__dict__.get('username')
+
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_superuser
@@ -37,3 +49,46 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ['last_name', 'first_name']
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ожидающее отправки фоновым обработчиком send_outbox."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'ожидает отправки'),
+        (SENT, 'отправлено'),
+        (FAILED, 'не отправлено'),
+    )
+
+    subject = models.CharField('Тема', max_length=255)
+    message = models.TextField('Текст письма')
+    from_email = models.EmailField('Отправитель')
+    recipient = models.EmailField('Получатель')
+    status = models.CharField(
+        'Статус', choices=STATUS_CHOICES, max_length=10, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                condition=models.Q(status='pending'),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,83 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+TITLES_COUNT = 25
+USERS_COUNT = 12
+COMMENTS_PER_REVIEW = USERS_COUNT
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from api.v1.authentication import user_cache
+
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                                Title)
+
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(5)
+    ]
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {i:02}',
+            year=1950 + i,
+            description='Описание',
+            category=categories[i % len(categories)],
+        )
+        for i in range(TITLES_COUNT)
+    ]
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[(i + shift) % len(genres)])
+        for i, title in enumerate(titles)
+        for shift in (0, 1)
+    )
+    users = [
+        django_user_model.objects.create_user(
+            username=f'user{i}', email=f'user{i}@yamdb.fake'
+        )
+        for i in range(USERS_COUNT)
+    ]
+    popular = titles[0]
+    reviews = [
+        Review.objects.create(
+            title=popular, author=user, text='Обзор', score=i % 10 + 1
+        )
+        for i, user in enumerate(users)
+    ]
+    Comment.objects.bulk_create(
+        Comment(review=review, author=users[i], text='Комментарий')
+        for review in reviews
+        for i in range(COMMENTS_PER_REVIEW)
+    )
+    return {
+        'title': popular,
+        'review': reviews[0],
+        'category': categories[0],
+        'genre': genres[0],
+        'user': users[0],
+    }
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='testadmin@yamdb.fake', role='admin'
+    )
+
+
+@pytest.fixture
+def admin_client(admin):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
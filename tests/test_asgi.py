@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+
+def call_asgi(application, scope, messages):
+    sent = []
+    incoming = list(messages)
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent
+
+
+def http_scope(method, path, query_string=b''):
+    return {
+        'type': 'http', 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': path, 'root_path': '',
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 5000),
+    }
+
+
+@pytest.fixture
+def application():
+    from api_yamdb.asgi_handler import ThreadPoolAsgiHandler
+    from django.core.wsgi import get_wsgi_application
+
+    handler = ThreadPoolAsgiHandler(get_wsgi_application(), 2, 2)
+    yield handler
+    handler.executor.shutdown()
+    handler.hot_read_executor.shutdown()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiHandler:
+
+    def test_hot_read_served_by_read_pool(self, application, catalog):
+        title = catalog['title']
+        sent = call_asgi(
+            application,
+            http_scope('GET', f'/api/v1/titles/{title.pk}/'),
+            [{'type': 'http.request', 'body': b''}],
+        )
+        assert sent[0]['type'] == 'http.response.start'
+        assert sent[0]['status'] == 200, (
+            'Проверьте, что ASGI-режим отдаёт произведение'
+        )
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        assert json.loads(body)['id'] == title.pk
+        assert not sent[-1].get('more_body'), (
+            'Проверьте, что ответ завершается сообщением без more_body'
+        )
+        assert application.get_executor(
+            http_scope('GET', '/api/v1/titles/')
+        ) is application.hot_read_executor
+        assert application.get_executor(
+            http_scope('POST', '/api/v1/titles/')
+        ) is application.executor, (
+            'Проверьте, что запись не занимает пул горячих чтений'
+        )
+
+    def test_request_body_is_passed(self, application):
+        payload = json.dumps({'email': 'asgi@yamdb.ru', 'username': 'asgi'})
+        payload = payload.encode()
+        scope = http_scope('POST', '/api/v1/auth/signup/')
+        scope['headers'].append((b'content-type', b'application/json'))
+        sent = call_asgi(application, scope, [
+            {'type': 'http.request', 'body': payload[:10], 'more_body': True},
+            {'type': 'http.request', 'body': payload[10:]},
+        ])
+        assert sent[0]['status'] == 200, (
+            'Проверьте, что тело запроса из нескольких сообщений без '
+            'Content-Length передаётся приложению целиком'
+        )
+
+    def test_lifespan(self, application):
+        sent = call_asgi(application, {'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'},
+        ])
+        assert [message['type'] for message in sent] == [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete',
+        ]
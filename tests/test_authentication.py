@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+
+    def token_client(self, user):
+        response = APIClient().post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == 200, response.data
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["token"]}')
+        return client
+
+    def anonymous_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            APIClient().get(url)
+        return len(context)
+
+    def test_cached_user_costs_no_queries(self, catalog,
+                                          django_assert_num_queries):
+        url = f'/api/v1/titles/{catalog["title"].id}/reviews/'
+        client = self.token_client(catalog['user'])
+        expected = self.anonymous_queries(url)
+        client.get(url)
+        with django_assert_num_queries(expected):
+            assert client.get(url).status_code == 200
+
+    def test_user_save_invalidates_cache(self, catalog):
+        user = catalog['user']
+        client = self.token_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        user.role = 'admin'
+        user.save()
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что изменение пользователя сбрасывает кэш'
+        )
+
+    def test_stateless_tokens(self, catalog, settings,
+                              django_assert_num_queries):
+        settings.AUTH_STATELESS_TOKENS = True
+        url = f'/api/v1/titles/{catalog["title"].id}/reviews/'
+        client = self.token_client(catalog['user'])
+        expected = self.anonymous_queries(url)
+        with django_assert_num_queries(expected):
+            assert client.get(url).status_code == 200
+        response = client.get('/api/v1/users/me/')
+        assert response.data['email'] == catalog['user'].email
+
+    def test_inactive_user(self, catalog, settings):
+        from api.v1.authentication import add_user_claims, user_cache
+        from rest_framework_simplejwt.tokens import AccessToken
+        from users.models import User
+
+        user = catalog['user']
+        client = self.token_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        # Блокировка в другом процессе: запись в кэше живёт до таймаута.
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        user_cache.clear()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что заблокированный пользователь не проходит '
+            'аутентификацию'
+        )
+        assert response.json()['code'] == 'user_inactive'
+
+        settings.AUTH_STATELESS_TOKENS = True
+        user.is_active = False
+        token = add_user_claims(AccessToken.for_user(user), user)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401
+        assert response.json()['code'] == 'user_inactive'
+
+    def test_stateless_user_fields(self, catalog):
+        from api.v1.authentication import (TOKEN_USER_CLAIMS, add_user_claims,
+                                           user_from_claims)
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = catalog['user']
+        user.role = 'moderator'
+        user.save()
+        token = add_user_claims(AccessToken.for_user(user), user)
+        built = user_from_claims(token)
+        for name in ('pk', *TOKEN_USER_CLAIMS):
+            assert getattr(built, name) == getattr(user, name), (
+                f'Проверьте поле {name} пользователя из токена'
+            )
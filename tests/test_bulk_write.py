@@ -0,0 +1,133 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkWrite:
+
+    def test_titles_bulk(self, catalog, admin_client,
+                         django_assert_max_num_queries):
+        from django.db import connection
+        from reviews.models import GenreTitle, Title
+
+        items = [
+            {
+                'name': f'Новинка {i}', 'year': 2000 + i,
+                'category': 'category-1', 'genre': ['genre-0', 'genre-2'],
+            }
+            for i in range(20)
+        ]
+        items.append({'name': 'Без категории', 'year': 2001,
+                      'category': 'missing', 'genre': ['genre-0']})
+        items.append({'name': 'Без года', 'category': 'category-1',
+                      'genre': []})
+        # Без RETURNING произведения сохраняются по одному.
+        returns_ids = connection.features.can_return_ids_from_bulk_insert
+        budget = 8 if returns_ids else 28
+        with django_assert_max_num_queries(budget):
+            response = admin_client.post(
+                '/api/v1/titles/bulk/', items, format='json'
+            )
+        assert response.status_code == 207, (
+            'Проверьте, что частично успешный пакет возвращает 207'
+        )
+        results = response.json()
+        statuses = [result['status'] for result in results]
+        assert statuses == [201] * 20 + [400, 400]
+        assert 'category' in results[20]['errors']
+        assert 'year' in results[21]['errors']
+        title = Title.objects.get(pk=results[0]['data']['id'])
+        assert title.name == 'Новинка 0'
+        assert set(
+            GenreTitle.objects.filter(title=title)
+            .values_list('genre__slug', flat=True)
+        ) == {'genre-0', 'genre-2'}
+
+    def test_titles_bulk_admin_only(self, catalog):
+        client = APIClient()
+        client.force_authenticate(user=catalog['user'])
+        response = client.post('/api/v1/titles/bulk/', [{}], format='json')
+        assert response.status_code == 403
+
+    def test_reviews_bulk_keeps_constraints_and_rating(self, catalog):
+        from reviews.models import Review, Title
+
+        client = APIClient()
+        client.force_authenticate(user=catalog['user'])
+        reviewed = catalog['title'].id
+        fresh = list(
+            Title.objects.exclude(pk=reviewed).values_list('pk', flat=True)
+        )
+        items = [
+            {'title': fresh[0], 'text': 'Отлично', 'score': 10},
+            {'title': fresh[1], 'text': 'Неплохо', 'score': 6},
+            {'title': fresh[1], 'text': 'Повтор', 'score': 7},
+            {'title': reviewed, 'text': 'Уже есть', 'score': 5},
+            {'title': fresh[2], 'text': 'Вне шкалы', 'score': 11},
+            {'title': 0, 'text': 'Нет такого', 'score': 5},
+        ]
+        response = client.post(
+            '/api/v1/reviews/bulk/', items, format='json'
+        )
+        assert response.status_code == 207
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 201, 400, 400, 400, 400
+        ]
+        assert results[0]['data']['author'] == catalog['user'].username
+        assert Review.objects.filter(pk=results[0]['data']['id']).exists()
+        assert 'score' in results[4]['errors']
+        assert 'title' in results[5]['errors']
+        for title_id, score in ((fresh[0], 10), (fresh[1], 6)):
+            title = Title.objects.get(pk=title_id)
+            assert (title.score_sum, title.review_count) == (score, 1), (
+                'Проверьте, что пакетная запись обновляет рейтинг'
+            )
+
+    def test_reviews_bulk_loses_repeated_races(self, catalog, monkeypatch):
+        from django.db import IntegrityError
+        from django.db.models import QuerySet
+        from reviews.models import Review, Title
+
+        user = catalog['user']
+        fresh = list(Title.objects.exclude(
+            pk=catalog['title'].pk
+        ).values_list('pk', flat=True)[:3])
+        rivals = [fresh[0], fresh[2]]
+        taken = set()
+        bulk_create = QuerySet.bulk_create
+
+        def race(queryset, objs, *args, **kwargs):
+            # Параллельный запрос фиксирует свой обзор перед каждой из
+            # первых двух вставок.
+            objs = list(objs)
+            if queryset.model is Review:
+                if rivals:
+                    taken.add(rivals.pop(0))
+                if any(review.title_id in taken for review in objs):
+                    raise IntegrityError('unique_title_author')
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        monkeypatch.setattr(QuerySet, 'bulk_create', race)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post('/api/v1/reviews/bulk/', [
+            {'title': pk, 'text': 'Обзор', 'score': 8} for pk in fresh
+        ], format='json')
+        assert response.status_code == 207
+        assert [
+            result['status'] for result in response.json()
+        ] == [400, 201, 400], (
+            'Проверьте, что повторный конфликт вставки даёт ошибки '
+            'элементов, а не 500'
+        )
+        title = Title.objects.get(pk=fresh[1])
+        assert (title.score_sum, title.review_count) == (8, 1)
+
+    def test_limits(self, catalog, admin_client, settings):
+        settings.BULK_WRITE_MAX_ITEMS = 2
+        for payload in ([], {}, [{}, {}, {}]):
+            response = admin_client.post(
+                '/api/v1/titles/bulk/', payload, format='json'
+            )
+            assert response.status_code == 400
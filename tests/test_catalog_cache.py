@@ -0,0 +1,83 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def catalog_cache(settings):
+    # В тестах один процесс, поэтому LocMemCache годится.
+    settings.CATALOG_CACHE_ENABLED = True
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCatalogCache:
+
+    def test_repeated_get_is_served_from_cache(
+            self, catalog, django_assert_num_queries):
+        client = APIClient()
+        url = '/api/v1/titles/?page=2'
+        first = client.get(url)
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос обслуживается из кэша'
+        )
+        assert second.data == first.data
+        assert client.get('/api/v1/titles/?page=1')['X-Cache'] == 'MISS', (
+            'Проверьте, что номер страницы входит в ключ кэша'
+        )
+
+    @pytest.mark.parametrize('change', ('review', 'genre', 'category'))
+    def test_write_invalidates_titles(self, catalog, change):
+        from reviews.models import Review
+
+        client = APIClient()
+        title = catalog['title']
+        url = f'/api/v1/titles/{title.id}/'
+        client.get(url)
+        if change == 'review':
+            Review.objects.filter(title=title).first().delete()
+        elif change == 'genre':
+            title.genre.clear()
+        else:
+            catalog['category'].delete()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение данных сбрасывает кэш произведений'
+        )
+        title.refresh_from_db()
+        assert response.data['rating'] == int(title.rating)
+
+    def test_category_cache_ignores_reviews(self, catalog):
+        from reviews.models import Review
+
+        client = APIClient()
+        client.get('/api/v1/categories/')
+        Review.objects.first().delete()
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'HIT'
+
+    @pytest.mark.parametrize(
+        'url, model', (('genres', 'genre'), ('categories', 'category'))
+    )
+    def test_no_detail_for_slug_lists(self, catalog, url, model):
+        response = APIClient().get(f'/api/v1/{url}/{catalog[model].slug}/')
+        assert response.status_code == 405, (
+            'Проверьте, что кэш не открывает GET-запрос к объекту'
+        )
+
+    def test_stats(self, catalog, admin_client):
+        client = APIClient()
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        response = admin_client.get('/api/v1/cache-stats/')
+        assert response.data == {'hits': 1, 'misses': 1}
+        assert client.get('/api/v1/cache-stats/').status_code == 401
+
+    def test_disabled_with_process_local_cache(self, catalog, settings):
+        settings.CATALOG_CACHE_ENABLED = False
+        client = APIClient()
+        client.get('/api/v1/titles/')
+        response = client.get('/api/v1/titles/')
+        assert 'X-Cache' not in response, (
+            'Проверьте, что без общего кэша ответы не кэшируются'
+        )
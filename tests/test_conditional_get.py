@@ -0,0 +1,122 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    def test_title_detail_not_modified(
+            self, catalog, django_assert_max_num_queries):
+        client = APIClient()
+        url = f'/api/v1/titles/{catalog["title"].id}/'
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response['ETag']
+        with django_assert_max_num_queries(1):
+            not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304, (
+            'Проверьте, что совпавший If-None-Match возвращает 304'
+        )
+        assert not_modified['ETag'] == etag
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == 304, (
+            'Проверьте, что If-Modified-Since возвращает 304'
+        )
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        ).status_code == 200
+
+    @pytest.mark.parametrize('change', ('review', 'genre', 'category'))
+    def test_title_etag_follows_changes(self, catalog, change):
+        from reviews.models import Review
+
+        client = APIClient()
+        title = catalog['title']
+        urls = (f'/api/v1/titles/{title.id}/', '/api/v1/titles/')
+        etags = [client.get(url)['ETag'] for url in urls]
+        if change == 'review':
+            Review.objects.filter(title=title).first().delete()
+        elif change == 'genre':
+            genre = catalog['genre']
+            genre.name = 'Переименованный жанр'
+            genre.save()
+        else:
+            catalog['category'].delete()
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что изменение ({change}) меняет ETag {url}'
+            )
+
+    def test_review_and_comment_lists(self, catalog, admin):
+        from reviews.models import Comment
+
+        client = APIClient()
+        review = catalog['review']
+        base = f'/api/v1/titles/{review.title_id}/reviews/'
+        for url in (base, f'{base}{review.id}/comments/'):
+            response = client.get(url)
+            assert 'Last-Modified' in response
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code == 304
+        etag = client.get(f'{base}{review.id}/comments/')['ETag']
+        Comment.objects.filter(review=review).first().delete()
+        assert client.get(
+            f'{base}{review.id}/comments/', HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Проверьте, что удаление комментария меняет ETag списка'
+        )
+        comment = Comment.objects.filter(review=review).first()
+        client.force_authenticate(user=admin)
+        response = client.delete(f'{base}{review.id}/comments/{comment.id}/')
+        assert response.status_code == 204
+        updated = review.updated
+        review.refresh_from_db()
+        assert review.updated > updated, (
+            'Проверьте, что удаление комментария через API сдвигает '
+            'дату изменения обзора'
+        )
+
+    def test_author_changes(self, catalog):
+        from reviews.models import Comment
+
+        client = APIClient()
+        review = catalog['review']
+        base = f'/api/v1/titles/{review.title_id}/reviews/'
+        comments = f'{base}{review.id}/comments/'
+        comment = Comment.objects.filter(review=review).exclude(
+            author=review.author
+        ).first()
+        for author, urls in (
+            (review.author, (base, f'{base}{review.id}/')),
+            (comment.author, (comments, f'{comments}{comment.id}/')),
+        ):
+            etags = [client.get(url)['ETag'] for url in urls]
+            author.username = f'renamed_{author.pk}'
+            author.save()
+            for url, etag in zip(urls, etags):
+                assert client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                ).status_code == 200, (
+                    f'Проверьте, что смена имени автора меняет ETag {url}'
+                )
+        updated = review.updated
+        comment.author.delete()
+        review.refresh_from_db()
+        assert review.updated > updated, (
+            'Проверьте, что каскадное удаление комментариев автора сдвигает '
+            'дату изменения обзора'
+        )
+
+    def test_page_changes_etag(self, catalog):
+        client = APIClient()
+        first = client.get('/api/v1/titles/?page=1')['ETag']
+        second = client.get('/api/v1/titles/?page=2')['ETag']
+        assert first != second
+
+    def test_missing_object(self, catalog):
+        client = APIClient()
+        assert client.get('/api/v1/titles/0/').status_code == 404
+        assert client.get('/api/v1/titles/0/reviews/').status_code == 404
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool:
+
+    def make_pool(self, **kwargs):
+        from api_yamdb.pool import ConnectionPool
+
+        return ConnectionPool(**{'size': 2, 'timeout': 0.05, **kwargs})
+
+    def test_reuses_idle_connections(self):
+        pool = self.make_pool()
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        assert pool.acquire(FakeConnection) is first, (
+            'Проверьте, что пул отдаёт свободное соединение повторно'
+        )
+        assert pool.stats()['created'] == 1
+
+    def test_bounded_with_timeout(self):
+        from api_yamdb.pool import PoolTimeoutError
+
+        pool = self.make_pool()
+        pool.acquire(FakeConnection)
+        pool.acquire(FakeConnection)
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(FakeConnection)
+        stats = pool.stats()
+        assert (stats['in_use'], stats['waits'], stats['timeouts']) == (
+            2, 1, 1
+        )
+
+    def test_waiting_thread_gets_released_connection(self):
+        pool = self.make_pool(size=1, timeout=5)
+        held = pool.acquire(FakeConnection)
+        acquired = []
+        waiter = threading.Thread(
+            target=lambda: acquired.append(pool.acquire(FakeConnection))
+        )
+        waiter.start()
+        while not pool.stats()['waits']:
+            pass
+        pool.release(held)
+        waiter.join(5)
+        assert acquired == [held]
+
+    def test_broken_connections_are_replaced(self):
+        pool = self.make_pool(check=lambda connection: False)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        second = pool.acquire(FakeConnection)
+        assert second is not first and first.closed
+        second.close()
+        pool.release(second)
+        stats = pool.stats()
+        assert (stats['in_use'], stats['idle'], stats['discarded']) == (
+            0, 0, 2
+        )
+
+    def test_failed_connect_frees_slot(self):
+        pool = self.make_pool(size=1)
+
+        def refuse():
+            raise OSError
+
+        with pytest.raises(OSError):
+            pool.acquire(refuse)
+        assert pool.stats()['in_use'] == 0
+
+
+@pytest.mark.django_db
+def test_db_stats(admin_client):
+    response = admin_client.get('/api/v1/db-stats/')
+    assert response.status_code == 200
+    assert response.data['default']['conn_max_age'] == 60
+    assert response.data['default']['pool'] is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_health_check_on_first_query(catalog, monkeypatch):
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    checks = []
+    is_usable = connection.is_usable
+    monkeypatch.setattr(
+        connection, 'is_usable', lambda: checks.append(1) or is_usable()
+    )
+    client = APIClient()
+    assert client.get('/api/v1/').status_code == 200
+    assert checks == [], (
+        'Проверьте, что запрос без обращения к БД не проверяет соединение'
+    )
+    assert client.get('/api/v1/titles/').status_code == 200
+    assert checks == [1], (
+        'Проверьте, что соединение проверяется один раз за запрос'
+    )
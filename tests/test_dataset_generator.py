@@ -0,0 +1,71 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenerateDataset:
+
+    def test_counts_and_rating_counters(self):
+        from django.db.models import Count, Sum
+        from reviews.models import (SCORES, Comment, GenreTitle, Review,
+                                    Title, User)
+
+        call_command(
+            'generate_dataset', users=30, titles=12, reviews=80, comments=150,
+            categories=3, genres=5, batch_size=17, seed=1,
+        )
+        assert User.objects.count() == 30
+        assert Title.objects.count() == 12
+        assert Comment.objects.count() == 150
+        assert not Title.objects.exclude(
+            pk__in=GenreTitle.objects.values('title_id')
+        ).exists(), 'Проверьте, что у каждого произведения есть жанр'
+        counts = list(
+            Title.objects.order_by('pk').values_list('review_count', flat=True)
+        )
+        assert sum(counts) == Review.objects.count() > 0
+        assert counts[0] == max(counts) > counts[-1], (
+            'Проверьте, что обзоры распределены неравномерно'
+        )
+        for title in Title.objects.annotate(
+            reviews_total=Count('reviews'), reviews_sum=Sum('reviews__score')
+        ):
+            assert title.review_count == title.reviews_total
+            assert title.score_sum == (title.reviews_sum or 0)
+            assert sum(
+                getattr(title, Title.score_count_field(score))
+                for score in SCORES
+            ) == title.review_count
+
+    def test_appends_after_existing_rows(self, catalog):
+        from reviews.models import Review, Title
+
+        before = Title.objects.count()
+        call_command(
+            'generate_dataset', users=5, titles=3, reviews=6, comments=0,
+            categories=1, genres=1,
+        )
+        assert Title.objects.count() == before + 3
+        # Последовательности сдвинуты, обычная вставка не конфликтует.
+        title = Title.objects.create(name='После генерации', year=2000)
+        assert title.pk > Title.objects.exclude(pk=title.pk).latest('pk').pk
+        assert Review.objects.filter(author__username__startswith='load')
+
+
+@pytest.mark.django_db
+def test_request_mix(catalog):
+    from api.management.commands.replay_load import DEFAULT_MIX, RequestMix
+    from reviews.models import Review
+
+    next_request = RequestMix(DEFAULT_MIX, seed=0)
+    names = {item[0] for item in DEFAULT_MIX}
+    for _ in range(200):
+        name, method, path, body = next_request()
+        assert name in names and method == 'GET' and body == b''
+        assert '{' not in path
+        if '/reviews/' in path and 'latest' not in path:
+            title, review = path.split('/')[4], path.split('/')[6]
+            if review:
+                assert Review.objects.filter(
+                    pk=review, title_id=title
+                ).exists()
@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+
+def streamed(response):
+    assert response.streaming, (
+        'Проверьте, что выгрузка отдаётся через StreamingHttpResponse'
+    )
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestCatalogExport:
+
+    def test_admin_only(self, catalog):
+        client = APIClient()
+        assert client.get('/api/v1/export/titles/').status_code == 401
+        client.force_authenticate(user=catalog['user'])
+        response = client.get('/api/v1/export/titles/?format=csv')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        assert response['Content-Type'].startswith('text/csv')
+
+    def test_titles_ndjson_match_list(self, catalog, admin_client, client,
+                                      settings):
+        from reviews.models import Title
+
+        settings.EXPORT_CHUNK_SIZE = 10
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        items = [json.loads(line) for line in streamed(response).splitlines()]
+        assert [item['id'] for item in items] == list(
+            Title.objects.order_by('pk').values_list('pk', flat=True)
+        ), 'Проверьте, что выгружаются все произведения по порядку id'
+        listed = {
+            item['id']: item
+            for page in (1, 2, 3)
+            for item in client.get(
+                f'/api/v1/titles/?page={page}'
+            ).json()['results']
+        }
+        assert all(item == listed[item['id']] for item in items), (
+            'Проверьте, что произведение в выгрузке совпадает с /titles/'
+        )
+
+    def test_titles_csv(self, catalog, admin_client):
+        response = admin_client.get('/api/v1/export/titles/?format=csv')
+        rows = list(csv.reader(io.StringIO(streamed(response))))
+        assert rows[0] == [
+            'id', 'name', 'year', 'description', 'category', 'genre',
+            'rating',
+        ]
+        title = catalog['title']
+        title.refresh_from_db()
+        row = next(row for row in rows if row[0] == str(title.pk))
+        assert row[4] == title.category.slug
+        assert row[5] == ','.join(
+            title.genre.order_by('name').values_list('slug', flat=True)
+        )
+        assert row[6] == str(int(title.score_sum / title.review_count))
+        assert 'attachment' in response['Content-Disposition']
+
+    def test_reviews(self, catalog, admin_client):
+        response = admin_client.get('/api/v1/export/reviews/?format=ndjson')
+        items = [json.loads(line) for line in streamed(response).splitlines()]
+        review = catalog['review']
+        assert len(items) == 12
+        assert items[0] == {
+            'id': review.pk,
+            'title': review.title_id,
+            'author': review.author.username,
+            'score': review.score,
+            'pub_date': admin_client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/'
+            ).json()['pub_date'],
+            'text': review.text,
+        }
+
+    def test_reads_in_chunks(self, catalog, admin_client, settings,
+                             django_assert_num_queries):
+        settings.EXPORT_CHUNK_SIZE = 10
+        response = admin_client.get('/api/v1/export/titles/')
+        # Строки произведений и по запросу жанров на каждую из трёх порций.
+        with django_assert_num_queries(4):
+            lines = streamed(response).splitlines()
+        assert len(lines) == 25
@@ -0,0 +1,35 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .fixtures.fixture_data import TITLES_COUNT
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def count(self, query):
+        response = APIClient().get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200, response.data
+        return response.data['count']
+
+    def test_genre_exact(self, catalog):
+        # Каждое произведение i относится к жанрам i % 5 и (i + 1) % 5.
+        assert self.count('genre=genre-0') == 10
+        assert self.count('genre=genre') == 0, (
+            'Проверьте, что параметр genre ищет slug жанра точно'
+        )
+
+    def test_genre_any_and_all(self, catalog):
+        assert self.count('genre=genre-0,genre-1') == 15
+        assert self.count('genre=genre-0,genre-1&genre_match=all') == 5
+        assert self.count('genre=genre-0,genre-2&genre_match=all') == 0
+
+    def test_genre_contains(self, catalog):
+        assert self.count('genre_contains=genre') == TITLES_COUNT, (
+            'Проверьте, что произведения не дублируются при поиске по жанрам'
+        )
+
+    def test_category(self, catalog):
+        assert self.count('category=category-0,category-1') == 17
+        assert self.count('category=category') == 0
+        assert self.count('category_contains=category') == TITLES_COUNT
@@ -0,0 +1,83 @@
+import pytest
+from django.core.management import call_command
+
+TOP_URL = '/api/v1/titles/top/'
+
+
+@pytest.fixture
+def rated(catalog, settings, django_user_model):
+    """Ещё пять произведений с тремя обзорами и одно с одним обзором."""
+    from reviews.models import Review, Title
+
+    settings.LEADERBOARD_MIN_REVIEWS = 3
+    users = list(django_user_model.objects.order_by('pk')[:3])
+    titles = list(Title.objects.exclude(pk=catalog['title'].pk)[:6])
+    for title, score in zip(titles, (7, 9, 3, 9, 6)):
+        for user in users:
+            Review.objects.create(
+                title=title, author=user, text='Обзор', score=score
+            )
+    Review.objects.create(
+        title=titles[5], author=users[0], text='Обзор', score=10
+    )
+    call_command('refresh_leaderboards', once=True)
+    return titles
+
+
+def ids(response):
+    assert response.status_code == 200
+    return [item['id'] for item in response.json()]
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    def test_overall(self, catalog, rated, client):
+        # Средняя оценка популярного произведения — 58 / 12.
+        assert ids(client.get(TOP_URL)) == [
+            rated[1].pk, rated[3].pk, rated[0].pk, rated[4].pk,
+            catalog['title'].pk, rated[2].pk,
+        ], (
+            'Проверьте, что произведения упорядочены по средней оценке, '
+            'а произведения с малым числом обзоров не попадают в рейтинг'
+        )
+        assert ids(client.get(f'{TOP_URL}?limit=2')) == [
+            rated[1].pk, rated[3].pk
+        ]
+        item = client.get(TOP_URL).json()[0]
+        assert item == client.get(f'/api/v1/titles/{rated[1].pk}/').json()
+
+    def test_by_category_and_genre(self, catalog, rated, client):
+        from reviews.models import Title
+
+        for board, model in (('category', 'category'), ('genre', 'genre')):
+            slug = catalog[model].slug
+            expected = [
+                pk for pk in ids(client.get(TOP_URL))
+                if Title.objects.filter(pk=pk, **{f'{board}__slug': slug})
+                .exists()
+            ]
+            assert expected
+            assert ids(client.get(f'{TOP_URL}?{board}={slug}')) == expected
+        assert ids(client.get(f'{TOP_URL}?genre=missing')) == []
+        response = client.get(
+            f'{TOP_URL}?genre={catalog["genre"].slug}'
+            f'&category={catalog["category"].slug}'
+        )
+        assert response.status_code == 400
+        assert client.get(f'{TOP_URL}?limit=1000').status_code == 400
+
+    def test_refresh_on_schedule(self, catalog, rated, client,
+                                 django_assert_max_num_queries):
+        from reviews.models import Review
+
+        for review in Review.objects.filter(title=rated[1]):
+            review.score = 1
+            review.save()
+        assert ids(client.get(TOP_URL))[0] == rated[1].pk, (
+            'Рейтинг меняется только при пересчёте'
+        )
+        call_command('refresh_leaderboards', once=True)
+        assert ids(client.get(TOP_URL))[0] == rated[3].pk
+        with django_assert_max_num_queries(2):
+            client.get(TOP_URL)
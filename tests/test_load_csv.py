@@ -0,0 +1,36 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_review_pairs_are_checked_exactly(catalog, tmp_path):
+    from reviews.models import Review, Title
+
+    title = catalog['title']
+    other = Title.objects.exclude(pk=title.pk).first()
+    author = catalog['user']
+    second = title.reviews.exclude(author=author).first().author
+    rows = [
+        # Пара из базы, новая пара и её повтор в следующем пакете.
+        (title.id, 'Повтор', author.id, 5, ''),
+        (other.id, 'Новый', author.id, 7, ''),
+        (other.id, 'Повтор из файла', author.id, 3, ''),
+        # Поля по отдельности уже встречались, но пара новая.
+        (other.id, 'Новый', second.id, 9, ''),
+    ]
+    with open(tmp_path / 'review.csv', 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(('title_id', 'text', 'author', 'score', 'pub_date'))
+        writer.writerows(rows)
+    call_command(
+        'load_csv', data_dir=str(tmp_path), batch_size=2, stdout=StringIO(),
+        stderr=StringIO(),
+    )
+    assert sorted(
+        Review.objects.filter(title=other).values_list('author', 'score')
+    ) == sorted([(author.id, 7), (second.id, 9)])
+    with open(tmp_path / 'rejected.csv', newline='') as rejects:
+        assert [row[1] for row in csv.reader(rejects)][1:] == ['2', '4']
@@ -0,0 +1,69 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestMultiGet:
+
+    def test_titles_by_ids(self, catalog, django_assert_max_num_queries):
+        from reviews.models import Title
+
+        ids = list(Title.objects.values_list('pk', flat=True)[:20])
+        url = f'/api/v1/titles/?ids={",".join(map(str, ids))}'
+        with django_assert_max_num_queries(3):
+            response = APIClient().get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data, list), (
+            'Проверьте, что выборка по ids возвращается без пагинации'
+        )
+        assert {title['id'] for title in data} == set(ids)
+        popular = next(t for t in data if t['id'] == catalog['title'].id)
+        catalog['title'].refresh_from_db()
+        assert popular['rating'] == int(catalog['title'].rating)
+
+    def test_titles_ids_limit(self, catalog, settings):
+        settings.MULTI_GET_MAX_IDS = 2
+        client = APIClient()
+        assert client.get('/api/v1/titles/?ids=1,2,3').status_code == 400
+        assert client.get('/api/v1/titles/?ids=a').status_code == 400
+
+    @pytest.mark.parametrize('ids', ('', ',', ' '))
+    def test_titles_blank_ids(self, catalog, ids):
+        response = APIClient().get(f'/api/v1/titles/?ids={ids}')
+        assert response.status_code == 400, (
+            'Проверьте, что пустой ?ids= не отдаёт весь каталог без страниц'
+        )
+        assert 'ids' in response.json()
+
+    def test_latest_reviews(self, catalog, django_assert_num_queries):
+        from reviews.models import Review, Title
+
+        other = Title.objects.exclude(pk=catalog['title'].id).first()
+        Review.objects.create(
+            title=other, author=catalog['user'], text='Один', score=4
+        )
+        url = (
+            f'/api/v1/reviews/latest/?titles={catalog["title"].id},'
+            f'{other.id},0&limit=3'
+        )
+        with django_assert_num_queries(2):
+            response = APIClient().get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['title'] for item in data] == [
+            catalog['title'].id, other.id, 0
+        ]
+        expected = list(
+            Review.objects.filter(title=catalog['title'])
+            .order_by('-pub_date', '-id')
+            .values_list('pk', flat=True)[:3]
+        )
+        assert [review['id'] for review in data[0]['reviews']] == expected
+        assert len(data[1]['reviews']) == 1
+        assert data[2]['reviews'] == []
+
+    @pytest.mark.parametrize('query', ('', 'titles=x', 'titles=1&limit=0'))
+    def test_latest_reviews_validation(self, catalog, query):
+        response = APIClient().get(f'/api/v1/reviews/latest/?{query}')
+        assert response.status_code == 400
@@ -0,0 +1,58 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .fixtures.fixture_data import TITLES_COUNT
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def walk(self, url):
+        client = APIClient()
+        ids = []
+        url = f'{url}?cursor='
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+            )
+            assert 'count' not in response.data, (
+                'Проверьте, что курсорный режим не выполняет COUNT(*)'
+            )
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_titles_cursor(self, catalog):
+        from reviews.models import Title
+
+        # Одинаковые названия на границе страниц.
+        Title.objects.bulk_create(
+            Title(name='Произведение 09', year=2000) for _ in range(12)
+        )
+        assert self.walk('/api/v1/titles/') == list(
+            Title.objects.order_by('id').values_list('id', flat=True)
+        )
+
+    def test_reviews_cursor(self, catalog):
+        title = catalog['title']
+        ids = self.walk(f'/api/v1/titles/{title.id}/reviews/')
+        assert ids == sorted(
+            title.reviews.values_list('id', flat=True), reverse=True
+        )
+
+    def test_comments_cursor(self, catalog):
+        review = catalog['review']
+        ids = self.walk(
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/'
+        )
+        assert ids == sorted(
+            review.comments.values_list('id', flat=True), reverse=True
+        )
+
+    def test_page_number_by_default(self, catalog):
+        response = APIClient().get('/api/v1/titles/')
+        assert response.data['count'] == TITLES_COUNT, (
+            'Проверьте, что без параметра cursor используется '
+            'постраничная пагинация'
+        )
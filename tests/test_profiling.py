@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+
+    def test_disabled_by_default(self, catalog):
+        response = APIClient().get('/api/v1/titles/', HTTP_X_PROFILE='1')
+        assert 'Server-Timing' not in response
+
+    def test_header_opt_in(self, catalog, settings):
+        settings.PROFILING_ALLOW_HEADER = True
+        client = APIClient()
+        assert 'Server-Timing' not in client.get('/api/v1/titles/')
+        timing = client.get('/api/v1/titles/?page=2', HTTP_X_PROFILE='1')[
+            'Server-Timing'
+        ]
+        names = [part.split(';')[0] for part in timing.split(', ')]
+        assert names == ['db', 'view', 'serialize', 'render', 'total']
+        assert 'desc="4 queries"' in timing, (
+            'Проверьте, что в Server-Timing попадает число SQL-запросов'
+        )
+        serialize = float(timing.split('serialize;dur=')[1].split(',')[0])
+        assert serialize > 0, (
+            'Проверьте, что сериализация замеряется отдельно от представления'
+        )
+
+    def test_sampling_and_slow_log(self, catalog, settings, caplog):
+        settings.PROFILING_SAMPLE_RATE = 1
+        settings.PROFILING_SLOW_REQUEST_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.profiling'):
+            response = APIClient().get('/api/v1/genres/')
+        assert 'Server-Timing' in response
+        assert '/api/v1/genres/' in caplog.text
+
+    def test_streaming_queries_are_logged_on_close(
+        self, catalog, admin_client, settings, caplog
+    ):
+        settings.PROFILING_SAMPLE_RATE = 1
+        settings.PROFILING_SLOW_REQUEST_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api.profiling'):
+            response = admin_client.get('/api/v1/export/titles/')
+            assert 'queries before streaming' in response['Server-Timing']
+            assert not caplog.records
+            b''.join(response.streaming_content)
+            response.close()
+        assert len(caplog.records) == 1
+        assert 'SQL: 2 за' in caplog.text, (
+            'Проверьте, что SQL потоковой выдачи попадает в профиль'
+        )
@@ -0,0 +1,153 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver
+from rest_framework.test import APIClient
+
+# Максимальное число SQL-запросов на один GET-запрос к маршруту API.
+# Страница содержит 10 объектов, поэтому N+1 сразу превышает бюджет.
+# Ещё один запрос считает валидаторы условного GET (ETag, Last-Modified).
+QUERY_BUDGETS = {
+    'api-root': 0,
+    'user-list': 2,
+    'user-detail': 1,
+    'user-me': 0,
+    'titles-list': 4,
+    'titles-detail': 3,
+    'titles-top': 2,
+    'titles-score-distribution': 1,
+    'genres-list': 2,
+    'categories-list': 2,
+    'reviews-list': 4,
+    'reviews-detail': 3,
+    'reviews-latest': 2,
+    'comments-list': 4,
+    'comments-detail': 3,
+    'export': 2,
+    'cache-stats': 0,
+    'db-stats': 0,
+    'throttle-stats': 1,
+}
+
+
+def get_route_names(patterns):
+    """Имена маршрутов, которые отвечают на GET, включая вложенные."""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= get_route_names(pattern.url_patterns)
+            continue
+        actions = getattr(pattern.callback, 'actions', None)
+        if actions is None:
+            has_get = hasattr(pattern.callback.view_class, 'get')
+        else:
+            has_get = 'get' in actions
+        if has_get:
+            names.add(pattern.name)
+    return names
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+
+    def urls(self, catalog, admin):
+        title_id = catalog['title'].id
+        review_id = catalog['review'].id
+        return {
+            'api-root': '/api/v1/',
+            'user-list': '/api/v1/users/',
+            'user-detail': f'/api/v1/users/{catalog["user"].username}/',
+            'user-me': '/api/v1/users/me/',
+            'titles-list': '/api/v1/titles/',
+            'titles-detail': f'/api/v1/titles/{title_id}/',
+            'titles-top': '/api/v1/titles/top/',
+            'titles-score-distribution': (
+                f'/api/v1/titles/{title_id}/score-distribution/'
+            ),
+            'genres-list': '/api/v1/genres/',
+            'categories-list': '/api/v1/categories/',
+            'reviews-list': f'/api/v1/titles/{title_id}/reviews/',
+            'reviews-detail': (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/'
+            ),
+            'reviews-latest': f'/api/v1/reviews/latest/?titles={title_id}',
+            'comments-list': (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            ),
+            'comments-detail': (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+                f'{catalog["review"].comments.first().id}/'
+            ),
+            'export': '/api/v1/export/titles/',
+            'cache-stats': '/api/v1/cache-stats/',
+            'db-stats': '/api/v1/db-stats/',
+            'throttle-stats': '/api/v1/throttle-stats/',
+        }
+
+    def test_every_endpoint_has_budget(self):
+        from api.urls import v1_urls
+
+        missing = get_route_names(v1_urls) - set(QUERY_BUDGETS)
+        assert not missing, (
+            f'Проверьте, что для маршрутов {sorted(missing)} задан бюджет '
+            f'запросов'
+        )
+
+    @pytest.mark.parametrize('endpoint', sorted(QUERY_BUDGETS))
+    def test_query_budget(self, endpoint, catalog, admin, admin_client,
+                          django_assert_max_num_queries):
+        url = self.urls(catalog, admin)[endpoint]
+        with django_assert_max_num_queries(QUERY_BUDGETS[endpoint]):
+            response = admin_client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает статус 200'
+        )
+
+    @pytest.mark.parametrize('endpoint', ('reviews-list', 'comments-list'))
+    def test_list_queries_do_not_depend_on_page_size(
+        self, endpoint, catalog, admin, admin_client
+    ):
+        url = self.urls(catalog, admin)[endpoint]
+        counts = []
+        # 10 объектов на первой странице и 2 на второй.
+        for page in (1, 2):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get(f'{url}?page={page}')
+            counts.append(len(queries))
+            assert response.status_code == 200
+        assert counts[0] == counts[1], (
+            'Проверьте, что авторы загружаются вместе с объектами страницы'
+        )
+
+    def test_author_check_does_not_load_user(self, catalog):
+        review = catalog['review']
+        client = APIClient()
+        client.force_authenticate(user=review.author)
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == 200
+        assert response.data['author'] == review.author.username
+        assert not [
+            query for query in queries if 'FROM "users_user"' in query['sql']
+        ], 'Проверьте, что проверка авторства не загружает пользователя'
+
+    def test_title_delete_does_not_depend_on_comments(self, catalog):
+        from reviews.models import Comment
+
+        title = catalog['title']
+        assert Comment.objects.filter(review__title=title).count() == 144
+        # Комментарии удаляются одним запросом по id обзоров, без выборки.
+        with CaptureQueriesContext(connection) as queries:
+            title.delete()
+        assert not [
+            query for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_comment"' in query['sql']
+        ], 'Проверьте, что комментарии удаляются каскадом одним запросом'
+        assert len(queries) <= 7, (
+            'Проверьте, что рейтинг удаляемого произведения не '
+            'пересчитывается по каждому обзору'
+        )
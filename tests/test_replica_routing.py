@@ -0,0 +1,111 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.functional import SimpleLazyObject
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASES = {
+        **settings.DATABASES, 'replica': settings.DATABASES['default']
+    }
+
+
+def route(request, status=200):
+    """База, выбранная маршрутизатором для чтения внутри запроса."""
+    from api.replica import PrimaryReplicaRouter, ReplicaRoutingMiddleware
+    from reviews.models import Title
+
+    chosen = []
+
+    def view(request):
+        chosen.append(PrimaryReplicaRouter().db_for_read(Title))
+        return HttpResponse(status=status)
+
+    ReplicaRoutingMiddleware(view)(request)
+    return chosen[0] or 'default'
+
+
+@pytest.mark.django_db
+class TestReplicaRouting:
+
+    def test_without_replica(self, catalog):
+        assert route(RequestFactory().get('/api/v1/titles/')) == 'default'
+
+    def test_safe_methods_read_replica(self, catalog, replica):
+        factory = RequestFactory()
+        assert route(factory.get('/api/v1/titles/')) == 'replica', (
+            'Проверьте, что GET-запросы читают с реплики'
+        )
+        assert route(factory.post('/api/v1/titles/')) == 'default'
+
+    def test_lazy_user_is_not_evaluated(self, catalog, replica):
+        def fail():
+            raise AssertionError('Пользователь не должен вычисляться')
+
+        request = RequestFactory().get('/api/v1/titles/')
+        request.user = SimpleLazyObject(fail)
+        assert route(request) == 'replica'
+
+    def test_write_pins_user_to_primary(self, catalog, replica, settings):
+        from reviews.models import Title
+
+        user = catalog['user']
+        title = Title.objects.exclude(pk=catalog['title'].pk).first()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            {'text': 'Новый обзор', 'score': 7},
+        )
+        assert response.status_code == 201
+
+        request = RequestFactory().get(f'/api/v1/titles/{title.id}/reviews/')
+        request.user = user
+        assert route(request) == 'default', (
+            'Проверьте, что после записи чтения пользователя идут на '
+            'основную БД'
+        )
+        other = RequestFactory().get(f'/api/v1/titles/{title.id}/reviews/')
+        other.user = catalog['review'].title.reviews.exclude(
+            author=user
+        ).first().author
+        assert route(other) == 'replica'
+
+    def test_pin_cookie_reaches_other_workers(self, catalog, replica):
+        from api.replica import PIN_COOKIE
+        from django.core.cache import cache
+
+        user = catalog['user']
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.patch(
+            f'/api/v1/titles/{catalog["title"].id}/reviews/'
+            f'{catalog["review"].id}/',
+            {'text': 'Исправленный обзор'},
+        )
+        assert response.status_code == 200
+        # Другой воркер не видит кэша процесса, в котором прошла запись.
+        cache.clear()
+        request = RequestFactory().get('/api/v1/titles/')
+        request.user = user
+        request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        assert route(request) == 'default', (
+            'Проверьте, что закрепление за основной БД передаётся cookie'
+        )
+        other = RequestFactory().get('/api/v1/titles/')
+        other.user = catalog['review'].title.reviews.exclude(
+            author=user
+        ).first().author
+        other.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        assert route(other) == 'replica'
+
+    def test_failed_write_does_not_pin(self, catalog, replica):
+        user = catalog['user']
+        post = RequestFactory().post('/api/v1/titles/')
+        post.user = user
+        route(post, status=400)
+        get = RequestFactory().get('/api/v1/titles/')
+        get.user = user
+        assert route(get) == 'replica'
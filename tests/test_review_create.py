@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+
+def author_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def reviews_url(title_id):
+    return f'/api/v1/titles/{title_id}/reviews/'
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+
+    def test_create_queries(self, catalog, django_user_model,
+                            django_assert_max_num_queries):
+        from reviews.models import Title
+
+        user = django_user_model.objects.create_user(
+            username='newcomer', email='newcomer@yamdb.fake'
+        )
+        title = catalog['title']
+        title.refresh_from_db()
+        # Точка сохранения, INSERT, сдвиг рейтинга и её освобождение.
+        with django_assert_max_num_queries(4):
+            response = author_client(user).post(
+                reviews_url(title.id), data={'text': 'Обзор', 'score': 10}
+            )
+        assert response.status_code == 201
+        assert response.data['author'] == 'newcomer'
+        updated = Title.objects.get(pk=title.id)
+        assert updated.review_count == title.review_count + 1
+        assert updated.score_sum == title.score_sum + 10
+
+    def test_duplicate(self, catalog):
+        from api.v1.serializers import DUPLICATE_REVIEW_MESSAGE
+        from reviews.models import Review, Title
+
+        title = catalog['title']
+        title.refresh_from_db()
+        response = author_client(catalog['user']).post(
+            reviews_url(title.id), data={'text': 'Ещё раз', 'score': 1}
+        )
+        assert response.status_code == 400
+        assert response.json() == {
+            'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]
+        }, 'Проверьте, что повторный обзор отклоняется с прежним сообщением'
+        assert Review.objects.filter(title=title).count() == 12
+        assert Title.objects.get(pk=title.id).score_sum == title.score_sum
+
+    def test_missing_title(self, catalog):
+        from reviews.models import Review
+
+        response = author_client(catalog['user']).post(
+            reviews_url(999999), data={'text': 'Обзор', 'score': 5}
+        )
+        assert response.status_code == 404
+        assert not Review.objects.filter(title_id=999999).exists()
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='одновременные транзакции проверяются на PostgreSQL',
+)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_double_post(catalog):
+    from django.db import connections
+    from reviews.models import Review, Title
+
+    title = Title.objects.exclude(pk=catalog['title'].pk).first()
+    barrier = threading.Barrier(2)
+    statuses = []
+
+    def post():
+        try:
+            barrier.wait()
+            statuses.append(author_client(catalog['user']).post(
+                reviews_url(title.id), data={'text': 'Обзор', 'score': 7}
+            ).status_code)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=post) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(statuses) == [201, 400]
+    title.refresh_from_db()
+    assert Review.objects.filter(title=title).count() == 1
+    assert (title.review_count, title.score_sum) == (1, 7)
@@ -0,0 +1,127 @@
+from io import StringIO
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestScoreDistribution:
+
+    def url(self, title):
+        return f'/api/v1/titles/{title.id}/score-distribution/'
+
+    def assert_consistent(self, title):
+        from reviews.models import Review
+
+        title.refresh_from_db()
+        scores = list(
+            Review.objects.filter(title=title).values_list('score', flat=True)
+        )
+        response = APIClient().get(self.url(title))
+        assert response.status_code == 200
+        data = response.json()
+        assert data['distribution'] == {
+            str(score): scores.count(score) for score in range(1, 11)
+        }, 'Проверьте, что распределение совпадает с оценками обзоров'
+        assert data['count'] == len(scores) == title.review_count
+        assert data['mean'] == title.rating
+        detail = APIClient().get(f'/api/v1/titles/{title.id}/').json()
+        assert data['rating'] == detail['rating'], (
+            'Проверьте, что рейтинг совпадает с карточкой произведения'
+        )
+
+    def test_distribution_follows_reviews(
+            self, catalog, django_assert_num_queries):
+        from reviews.models import Review, Title
+
+        title = catalog['title']
+        with django_assert_num_queries(1):
+            APIClient().get(self.url(title))
+        self.assert_consistent(title)
+
+        review = catalog['review']
+        review.score = 10 if review.score != 10 else 1
+        review.save()
+        self.assert_consistent(title)
+
+        other = Title.objects.exclude(pk=title.pk).first()
+        review.title = other
+        review.save()
+        self.assert_consistent(title)
+        self.assert_consistent(other)
+
+        Review.objects.filter(title=title).first().delete()
+        self.assert_consistent(title)
+
+    def test_author_delete(self, catalog, django_user_model):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Review, Title
+
+        author = django_user_model.objects.get(username='user1')
+        others = list(Title.objects.exclude(pk=catalog['title'].pk)[:3])
+        for title, score in zip(others, (2, 5, 9)):
+            Review.objects.create(
+                title=title, author=author, text='Обзор', score=score
+            )
+        with CaptureQueriesContext(connection) as queries:
+            author.delete()
+        assert len([
+            query for query in queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]) == 1, (
+            'Проверьте, что рейтинги произведений автора сдвигаются '
+            'одним запросом'
+        )
+        for title in (catalog['title'], *others):
+            self.assert_consistent(title)
+
+    def test_failed_title_delete(self, catalog):
+        from django.db import DatabaseError, transaction
+        from django.db.models.signals import post_delete
+        from reviews.models import Review
+
+        def fail(sender, **kwargs):
+            raise DatabaseError('Удаление прервано')
+
+        title = catalog['title']
+        post_delete.connect(fail, sender=Review)
+        try:
+            with pytest.raises(DatabaseError), transaction.atomic():
+                title.delete()
+        finally:
+            post_delete.disconnect(fail, sender=Review)
+        Review.objects.filter(title=title).first().delete()
+        self.assert_consistent(title)
+
+    def test_empty_title(self, catalog):
+        from reviews.models import Title
+
+        title = Title.objects.exclude(pk=catalog['title'].pk).first()
+        data = APIClient().get(self.url(title)).json()
+        assert data['count'] == 0
+        assert data['mean'] is None and data['rating'] is None
+        assert set(data['distribution'].values()) == {0}
+
+    def test_rebuild_restores_counters(self, catalog, settings):
+        from django.core.management import call_command
+        from reviews.models import Title
+
+        # Кэшированные валидаторы сбрасывает только новая версия модели.
+        settings.CATALOG_CACHE_ENABLED = True
+        title = catalog['title']
+        other = Title.objects.exclude(pk=title.pk).first()
+        Title.objects.filter(pk=title.pk).update(score_count_1=100)
+        client = APIClient()
+        etag = client.get(f'/api/v1/titles/{title.id}/')['ETag']
+        updated = Title.objects.get(pk=other.pk).updated
+        stdout = StringIO()
+        call_command('rebuild_title_ratings', stdout=stdout)
+        assert 'Исправлено произведений: 1' in stdout.getvalue()
+        self.assert_consistent(title)
+        assert client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Проверьте, что пересчёт рейтинга меняет ETag произведения'
+        )
+        assert Title.objects.get(pk=other.pk).updated == updated
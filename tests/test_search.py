@@ -0,0 +1,22 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestSearch:
+
+    @pytest.mark.parametrize('rank', ('', '&rank=true'))
+    def test_genre_search(self, catalog, rank):
+        response = APIClient().get(f'/api/v1/genres/?search=анр 3{rank}')
+        assert response.status_code == 200
+        assert [genre['slug'] for genre in response.data['results']] == [
+            'genre-3'
+        ], 'Проверьте поиск жанров по подстроке названия'
+
+    @pytest.mark.parametrize('rank', ('', '&rank=true'))
+    def test_title_name_filter(self, catalog, rank):
+        response = APIClient().get(f'/api/v1/titles/?name=ение 1{rank}')
+        assert response.status_code == 200
+        assert {title['name'] for title in response.data['results']} == {
+            f'Произведение {i}' for i in range(10, 20)
+        }, 'Проверьте фильтрацию произведений по подстроке названия'
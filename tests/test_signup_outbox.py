@@ -0,0 +1,52 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestSignupOutbox:
+    url = '/api/v1/auth/signup/'
+    data = {'username': 'newbie', 'email': 'newbie@yamdb.fake'}
+
+    def test_signup_queues_email(self):
+        from users.models import OutboxEmail
+
+        response = APIClient().post(self.url, data=self.data)
+        assert response.status_code == 200
+        assert response.data == self.data
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется сразу'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == self.data['email']
+        assert email.status == OutboxEmail.PENDING
+
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [self.data['email']]
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.SENT
+
+    def test_failed_send_is_retried(self, monkeypatch, settings):
+        from users.models import OutboxEmail
+
+        APIClient().post(self.url, data=self.data)
+
+        def broken_send(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send)
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        call_command('send_outbox', '--once')
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+
+        OutboxEmail.objects.update(next_attempt_at=email.created)
+        call_command('send_outbox', '--once')
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.FAILED
+        assert email.attempts == 2
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+CHECK_API_PROFILE = '''
+from django.apps import apps
+from django.urls import get_resolver, resolve
+
+import api_yamdb.wsgi
+
+print(get_resolver()._populated)
+print(apps.is_installed('django.contrib.admin'))
+print(resolve('/api/v1/titles/').url_name)
+'''
+
+
+class TestStartup:
+
+    def test_api_profile_boots_warm(self):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings_api'}
+        output = subprocess.run(
+            [sys.executable, '-c', CHECK_API_PROFILE],
+            cwd=settings.BASE_DIR, env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout.split()
+        assert output[0] == 'True', (
+            'Проверьте, что загрузка api_yamdb.wsgi прогревает URL-резолвер'
+        )
+        assert output[1] == 'False', (
+            'Проверьте, что API-профиль настроек не загружает админку'
+        )
+        assert output[2] == 'titles-list'
+
+    def test_warm_up_builds_serializer_fields(self):
+        from api.v1.serializers import ReviewSerializer, TitleGetSerializer
+        from api_yamdb.warmup import project_serializers, warm_up
+
+        serializers = set(project_serializers())
+        assert {ReviewSerializer, TitleGetSerializer} <= serializers
+        assert all(
+            not cls.__module__.startswith('rest_framework')
+            for cls in serializers
+        ), 'Проверьте, что прогреваются только сериализаторы проекта'
+        warm_up()
@@ -0,0 +1,111 @@
+import pytest
+from rest_framework.test import APIClient
+
+TOKEN_URL = '/api/v1/auth/token/'
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'signup-ip': None, 'signup-username': None,
+                'token-ip': None, 'token-username': None,
+                **{scope.replace('_', '-'): rate
+                   for scope, rate in rates.items()},
+            },
+        }
+    return set_rates
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api.v1.throttling import TokenBucketThrottle
+
+    now = [1000.0]
+    monkeypatch.setattr(
+        TokenBucketThrottle, 'timer', staticmethod(lambda: now[0])
+    )
+    return now
+
+
+def guess(client, username):
+    return client.post(TOKEN_URL, data={
+        'username': username, 'confirmation_code': 'wrong',
+    })
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    def test_token_per_username(self, catalog, rates, clock):
+        rates(token_username='3/min')
+        username = catalog['user'].username
+        statuses = [
+            guess(APIClient(REMOTE_ADDR=f'10.0.0.{i}'), username).status_code
+            for i in range(4)
+        ]
+        assert statuses == [400, 400, 400, 429], (
+            'Проверьте, что подбор кода для одного имени ограничен '
+            'с любых адресов'
+        )
+        response = guess(APIClient(), username.upper())
+        assert response.status_code == 429
+        assert int(response['Retry-After']) == 20
+        assert guess(APIClient(), 'someone-else').status_code == 404
+
+        # Ведро пополняется равномерно: 3 запроса в минуту — один за 20 с.
+        clock[0] += 20
+        assert guess(APIClient(), username).status_code == 400
+        assert guess(APIClient(), username).status_code == 429
+
+    def test_signup_per_ip(self, rates, clock):
+        rates(signup_ip='2/hour', signup_username='5/hour')
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+        statuses = [
+            client.post(SIGNUP_URL, data={
+                'username': f'user{i}', 'email': f'user{i}@yamdb.fake',
+            }).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+        # За прокси адрес клиента берётся из X-Forwarded-For.
+        proxied = APIClient(
+            REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='192.0.2.7'
+        )
+        assert proxied.post(SIGNUP_URL, data={
+            'username': 'user3', 'email': 'user3@yamdb.fake',
+        }).status_code == 200
+
+    def test_rejections_are_counted(self, catalog, admin_client, rates,
+                                    clock):
+        rates(token_ip='1/min')
+        client = APIClient()
+        for _ in range(3):
+            guess(client, catalog['user'].username)
+        response = admin_client.get('/api/v1/throttle-stats/')
+        assert response.status_code == 200
+        assert response.json() == {
+            'signup-ip': 0, 'signup-username': 0,
+            'token-ip': 2, 'token-username': 0,
+        }
+        client.force_authenticate(user=catalog['user'])
+        assert client.get('/api/v1/throttle-stats/').status_code == 403
+
+    def test_token_taken_once(self, catalog, rates, clock, monkeypatch):
+        from api.v1.throttling import THROTTLE_CACHE
+        from django.core.cache import caches
+
+        rates(token_username='2/min')
+        # Каждый запрос видит ведро полным, как одновременные запросы
+        # из разных воркеров.
+        monkeypatch.setattr(
+            caches[THROTTLE_CACHE], 'get_many', lambda keys, version=None: {}
+        )
+        username = catalog['user'].username
+        statuses = [guess(APIClient(), username).status_code for _ in range(3)]
+        assert statuses == [400, 400, 429], (
+            'Проверьте, что один жетон ведра не достаётся двум запросам'
+        )
@@ -0,0 +1,52 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+
+def render_titles(serializer_class, queryset):
+    return JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+@pytest.mark.django_db
+class TestTitleRowsListSerializer:
+
+    @pytest.fixture
+    def titles(self, catalog, django_user_model):
+        from reviews.models import Review, Title
+
+        # Крайние случаи: без категории, жанров, описания и обзоров,
+        # дробный рейтинг и названия не только в ASCII.
+        Title.objects.create(name='Без категории', year=2000)
+        catalog['title'].category.delete()
+        title = Title.objects.get(name='Произведение 01')
+        for user, score in zip(django_user_model.objects.all(), (7, 8)):
+            Review.objects.create(
+                title=title, author=user, text='Обзор', score=score
+            )
+        return Title.objects.order_by('name', 'pk')
+
+    def test_output_is_byte_identical(self, titles):
+        from api.v1.serializers import (TitleGetSerializer,
+                                        TitleListSerializer,
+                                        TitleRowsListSerializer)
+
+        expected = render_titles(
+            TitleGetSerializer,
+            titles.select_related('category').prefetch_related('genre'),
+        )
+        actual = render_titles(
+            TitleListSerializer, titles.values(*TitleRowsListSerializer.values)
+        )
+        assert actual == expected, (
+            'Проверьте, что быстрый сериализатор списка произведений '
+            'отдаёт те же байты, что и TitleGetSerializer'
+        )
+
+    def test_list_endpoint_matches_detail(self, client, titles):
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        for item in response.json()['results']:
+            detail = client.get(f'/api/v1/titles/{item["id"]}/').json()
+            assert item == detail, (
+                'Проверьте, что элемент списка совпадает с карточкой '
+                'произведения'
+            )